@@ -0,0 +1,160 @@
+"""Minimal stand-ins for the discord.py objects the commands and views touch.
+
+They record every Discord API call so benchmarks can count them, and they
+time the first response to each interaction (Discord's 3-second ack window).
+"""
+import itertools
+import time
+from collections import Counter
+
+_ids = itertools.count(1000)
+
+
+class FakeUser:
+    def __init__(self, user_id=None, name="bench-user"):
+        self.id = user_id or next(_ids)
+        self.name = name
+        self.bot = False
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, calls, content=None, embed=None, embeds=None, view=None, file=None):
+        self.id = next(_ids)
+        self.calls = calls
+        self.content = content
+        self.embed = embed
+        self.embeds = embeds
+        self.view = view
+        self.file = file
+        self.reactions = []
+
+    async def edit(self, **kwargs):
+        self.calls["message.edit"] += 1
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        return self
+
+    async def add_reaction(self, emoji):
+        self.calls["message.add_reaction"] += 1
+        self.reactions.append(emoji)
+
+    async def remove_reaction(self, emoji, member):
+        self.calls["message.remove_reaction"] += 1
+        if emoji in self.reactions:
+            self.reactions.remove(emoji)
+
+    async def clear_reactions(self):
+        self.calls["message.clear_reactions"] += 1
+        self.reactions.clear()
+
+
+class FakeBot:
+    def __init__(self, config, calls=None):
+        self.config = config
+        self.calls = calls if calls is not None else Counter()
+        self.user = FakeUser(name="rivbot")
+        self.active_recommended_messages = {}
+        self.background_tasks = set()
+        from core.notifications import SubscriptionStore
+        from helpers.reactions import ReactionManager
+
+        self.subscriptions = SubscriptionStore(config, path=None)
+        self.reaction_manager = ReactionManager(self)
+
+
+class FakeContext:
+    def __init__(self, bot, author=None, prefix="!"):
+        self.bot = bot
+        self.author = author or FakeUser()
+        self.prefix = prefix
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.bot.calls["channel.send"] += 1
+        message = FakeMessage(self.bot.calls, content=content, **kwargs)
+        self.sent.append(message)
+        return message
+
+    async def defer(self):
+        self.bot.calls["ctx.defer"] += 1
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        kwargs.pop("ephemeral", None)
+        kwargs.pop("wait", None)
+        self.interaction.calls["followup.send"] += 1
+        return FakeMessage(self.interaction.calls, content=content, **kwargs)
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    def _ack(self, name):
+        if self._done:
+            raise RuntimeError("Interaction has already been responded to")
+        self._done = True
+        self.interaction.acked_at = time.perf_counter()
+        self.interaction.calls[name] += 1
+
+    async def edit_message(self, **kwargs):
+        # The edit is carried by the interaction response, so it is not counted as message.edit.
+        self._ack("response.edit_message")
+        for key, value in kwargs.items():
+            setattr(self.interaction.message, key, value)
+
+    async def send_message(self, content=None, **kwargs):
+        self._ack("response.send_message")
+
+    async def defer(self, **kwargs):
+        self._ack("response.defer")
+
+
+class FakeInteraction:
+    def __init__(self, user, message, calls):
+        self.user = user
+        self.message = message
+        self.calls = calls
+        self.created_at = time.perf_counter()
+        self.acked_at = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    @property
+    def ack_latency(self):
+        return None if self.acked_at is None else self.acked_at - self.created_at
+
+    async def edit_original_response(self, **kwargs):
+        self.calls["interaction.edit_original_response"] += 1
+        for key, value in kwargs.items():
+            setattr(self.message, key, value)
+        return self.message
+
+    async def original_response(self):
+        self.calls["interaction.original_response"] += 1
+        return self.message
+
+
+async def drive_select(view, select, values, user=None):
+    """Simulate a user picking `values` in a select inside `view`."""
+    interaction = FakeInteraction(user or view.ctx.author, view.message, view.ctx.bot.calls)
+    select._values = list(values)
+    await select.callback(interaction)
+    return interaction
+
+
+async def drive_button(view, button, user=None):
+    interaction = FakeInteraction(user or view.ctx.author, view.message, view.ctx.bot.calls)
+    await button.callback(interaction)
+    return interaction
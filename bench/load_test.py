@@ -0,0 +1,142 @@
+"""Load test: many concurrent SearchView sessions against the stub upstreams.
+
+Run from the repository root:
+
+    python -m bench.load_test --users 200 --actions 6 --latency 0.05 --jitter 0.03
+
+Each simulated user opens a SearchView and performs a random sequence of
+dropdown picks, page turns and button presses with some think time between
+them. The report covers interaction-ack latency (and how many acks missed
+Discord's 3-second window), event loop lag and traced memory per live view.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+import tracemalloc
+
+from bench.fakes import FakeBot, FakeContext, FakeUser, drive_button, drive_select
+from bench.run_benchmarks import bench_config, percentile
+from bench.stub_server import StubUpstreams, route_requests_to
+
+ACK_DEADLINE = 3.0
+
+SEARCH_RESULTS = [
+    ("Breaking Bad", "2008", 8.9, 1396, "tv"),
+    ("Dune", "2021", 7.8, 438631, "movie"),
+] * 8
+
+
+class LagSampler:
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+
+def _choose_action(view, rng):
+    """Pick something a real user could click in the view's current state."""
+    from discord.ui import Button, Select
+
+    selects = [c for c in view.children if isinstance(c, Select) and c.options]
+    buttons = [c for c in view.children if isinstance(c, Button) and not c.disabled
+               and c.label in ("Previous", "Next", "Refresh", "Retry", "Reset")]
+    if selects and (not buttons or rng.random() < 0.7):
+        select = rng.choice(selects)
+        return "select", select, [rng.choice(select.options).value]
+    if buttons:
+        return "button", rng.choice(buttons), None
+    return None, None, None
+
+
+async def simulate_user(config, calls, rng, actions, think_time, acks, views):
+    from ui.views import SearchView
+
+    ctx = FakeContext(FakeBot(config, calls), author=FakeUser(name="bench-user"))
+    view = SearchView(ctx, list(SEARCH_RESULTS), "breaking bad")
+    view.message = await ctx.send(view=view)
+    views.append(view)
+    for _ in range(actions):
+        await asyncio.sleep(rng.uniform(0, think_time))
+        kind, item, values = _choose_action(view, rng)
+        if kind is None:
+            break
+        try:
+            if kind == "select":
+                interaction = await drive_select(view, item, values)
+            else:
+                interaction = await drive_button(view, item)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Simulated {kind} failed: {type(e).__name__}: {e}")
+            continue
+        if interaction.ack_latency is not None:
+            acks.append(interaction.ack_latency)
+
+
+async def main(args):
+    import core.logging_setup  # configures the root logger; adjust its level afterwards
+    from collections import Counter
+
+    logging.getLogger().setLevel(args.log_level)
+    stub = StubUpstreams(latency=args.latency, jitter=args.jitter, rate_limit_ratio=args.rate_limit, seed=args.seed).start()
+    restore = route_requests_to(stub.base_url)
+    config = bench_config(stub)
+    rng = random.Random(args.seed)
+    calls = Counter()
+    acks, views = [], []
+    sampler = LagSampler()
+    sampler_task = asyncio.create_task(sampler.run())
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            simulate_user(config, calls, random.Random(rng.random()), args.actions, args.think_time, acks, views)
+            for _ in range(args.users)
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        elapsed = time.perf_counter() - started
+        tracemalloc.stop()
+        sampler_task.cancel()
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.gather(*pending, return_exceptions=True)
+        restore()
+        stub.stop()
+
+    missed = sum(1 for a in acks if a > ACK_DEADLINE)
+    live_views = max(1, len(views))
+    print(f"users={args.users} actions/user={args.actions} wall={elapsed:.1f}s interactions={len(acks)}")
+    print(f"ack latency ms: p50={percentile(acks, 50) * 1000:.1f} p95={percentile(acks, 95) * 1000:.1f} "
+          f"p99={percentile(acks, 99) * 1000:.1f} max={max(acks, default=0) * 1000:.1f}")
+    print(f"acks over {ACK_DEADLINE:.0f}s: {missed} ({missed / max(1, len(acks)):.1%})")
+    print(f"loop lag ms: p50={percentile(sampler.samples, 50) * 1000:.1f} p99={percentile(sampler.samples, 99) * 1000:.1f} "
+          f"max={max(sampler.samples, default=0) * 1000:.1f}")
+    print(f"memory per live view: {(current - baseline) / live_views / 1024:.1f} KiB (peak total {peak / 1024 / 1024:.1f} MiB)")
+    print(f"upstream calls: {dict(stub.calls)}")
+    print(f"discord calls: {dict(calls)}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent SearchView users against stub upstreams.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--actions", type=int, default=5, help="Interactions per simulated user.")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Max random pause between interactions (s).")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-level", default="ERROR")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
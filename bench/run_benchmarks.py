@@ -0,0 +1,232 @@
+"""Offline benchmarks for the bot's hot paths.
+
+Run from the repository root:
+
+    python -m bench.run_benchmarks --iterations 50 --latency 0.05 --jitter 0.02 --rate-limit 0.05
+
+TMDB, Trakt and Riven are replaced by bench/stub_server.py, which replays the
+recorded responses in bench/fixtures. For each scenario the report shows
+p50/p95/p99 latency, upstream calls per run, Discord calls per run and peak
+traced memory. Pass --json to write the report for comparing runs.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from collections import Counter
+
+from bench.stub_server import StubUpstreams, route_requests_to
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_config(stub):
+    return {
+        "tmdb_api_key": "bench",
+        "trakt_api_key": "bench",
+        "riven_api_url": f"{stub.base_url}/riven",
+        "riven_api_token": "bench",
+        "whitelist": ["bench-user"],
+        "latest_releases_count": 20,
+        "max_grid_width": 1000,
+        "poster_image_width": 150,
+        "poster_image_height": 220,
+    }
+
+
+def clear_caches():
+    from core.cache import metadata_cache, search_cache
+
+    metadata_cache.clear()
+    search_cache.clear()
+
+
+async def scenario_search_cold(config):
+    from tmdb.search import search_tmdb_extended
+
+    clear_caches()
+    return search_tmdb_extended("breaking bad", config)
+
+
+async def scenario_search_warm(config):
+    from tmdb.search import search_tmdb_extended
+
+    return search_tmdb_extended("Breaking  Bad", config)
+
+
+async def scenario_search_year(config):
+    from tmdb.search import search_tmdb_extended
+
+    clear_caches()
+    return search_tmdb_extended("Dune 2021", config)
+
+
+async def scenario_details_tv(config):
+    from tmdb.details import fetch_tmdb_by_id
+
+    clear_caches()
+    return fetch_tmdb_by_id(1396, "tv", config)
+
+
+async def scenario_poster_grid(config):
+    from helpers.poster_grid import create_poster_grid
+
+    poster_info = [{"title": f"Release {i}", "poster_url": f"https://image.tmdb.org/t/p/w500/poster{i}.jpg"} for i in range(20)]
+    return await create_poster_grid(poster_info, config)
+
+
+async def scenario_poster_grid_process(config):
+    return await scenario_poster_grid({**config, "render_backend": "process"})
+
+
+_TORRENT_FILES = {
+    str(i): {"filename": f"Show.S{i // 20 + 1:02d}E{i % 20 + 1:02d}.1080p.WEB.mkv", "filesize": 900 * 1024 * 1024}
+    for i in range(2000)
+}
+_PARSED = [{"seasons": [i // 20 + 1], "episodes": [i % 20 + 1]} for i in range(2000)]
+
+
+async def scenario_scrape_payloads(config):
+    from helpers.scrape_payloads import filter_valid_files, build_select_files_payload, build_tv_update_payload
+
+    valid_files = filter_valid_files(_TORRENT_FILES, "show", "session")
+    build_select_files_payload(valid_files)
+    return build_tv_update_payload(valid_files, _PARSED)
+
+
+async def scenario_view_select_show(config):
+    from bench.fakes import FakeBot, FakeContext, drive_select
+    from ui.views import SearchView
+
+    clear_caches()
+    ctx = FakeContext(FakeBot(config))
+    results = [("Breaking Bad", "2008", 8.9, 1396, "tv"), ("Dune", "2021", 7.8, 438631, "movie")]
+    view = SearchView(ctx, results, "breaking bad")
+    view.message = await ctx.send(view=view)
+    await drive_select(view, view.children[0], ["0"])
+    await drive_select(view, view.children[0], ["1"])
+    return ctx.bot.calls
+
+
+SCENARIOS = {
+    "search_cold": scenario_search_cold,
+    "search_warm": scenario_search_warm,
+    "search_year": scenario_search_year,
+    "details_tv": scenario_details_tv,
+    "poster_grid_20": scenario_poster_grid,
+    "poster_grid_20_process": scenario_poster_grid_process,
+    "scrape_payloads_2000": scenario_scrape_payloads,
+    "view_select_show": scenario_view_select_show,
+}
+
+
+async def drain_background_tasks():
+    """Wait for prefetches and other fire-and-forget work started by a run."""
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_scenario(name, func, config, stub, iterations):
+    latencies = []
+    upstream = Counter()
+    discord_calls = Counter()
+    errors = 0
+    for _ in range(iterations):
+        stub.reset_counts()
+        started = time.perf_counter()
+        try:
+            result = await func(config)
+        except ImportError:
+            raise
+        except Exception as e:  # keep going so one failing run doesn't hide the rest of the report
+            errors += 1
+            result = None
+            print(f"  {name}: {type(e).__name__}: {e}")
+        latencies.append(time.perf_counter() - started)
+        await drain_background_tasks()
+        upstream.update(stub.calls)
+        if isinstance(result, Counter):
+            discord_calls.update(result)
+
+    # Memory is measured on a separate run so tracing does not skew the latencies.
+    tracemalloc.start()
+    try:
+        await func(config)
+        await drain_background_tasks()
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "iterations": iterations,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "upstream_calls_per_run": {k: v / iterations for k, v in sorted(upstream.items())},
+        "discord_calls_per_run": {k: v / iterations for k, v in sorted(discord_calls.items()) if v},
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def print_report(report):
+    print(f"{'scenario':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>11}  upstream/run  discord/run")
+    for row in report:
+        upstream = " ".join(f"{k}={v:g}" for k, v in row["upstream_calls_per_run"].items()) or "-"
+        discord_calls = " ".join(f"{k}={v:g}" for k, v in row["discord_calls_per_run"].items()) or "-"
+        print(f"{row['scenario']:<22}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+              f"{row['peak_memory_kib']:>11.1f}  {upstream}  {discord_calls}")
+
+
+async def main(args):
+    import core.logging_setup  # configures the root logger; adjust its level afterwards
+
+    logging.getLogger().setLevel(args.log_level)
+    stub = StubUpstreams(latency=args.latency, jitter=args.jitter, rate_limit_ratio=args.rate_limit, seed=args.seed).start()
+    restore = route_requests_to(stub.base_url)
+    config = bench_config(stub)
+    report = []
+    try:
+        for name, func in SCENARIOS.items():
+            if args.only and name not in args.only:
+                continue
+            try:
+                report.append(await run_scenario(name, func, config, stub, args.iterations))
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+    finally:
+        restore()
+        stub.stop()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against recorded TMDB/Trakt/Riven fixtures.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base upstream latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- latency in seconds.")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Share of upstream requests answered with 429.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios.")
+    parser.add_argument("--json", help="Write the report to this file.")
+    parser.add_argument("--log-level", default="WARNING", help="Log level for the bot's own logging during the run.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
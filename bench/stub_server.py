@@ -0,0 +1,169 @@
+"""Local stand-in for the TMDB, Trakt and Riven APIs used by the benchmarks.
+
+Responses are replayed from the JSON files in bench/fixtures. Every request
+can be delayed by a fixed latency plus random jitter, and a share of requests
+can be answered with 429 to see how the bot behaves under rate limiting.
+"""
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Upstream hosts are mapped to a path prefix on the stub server.
+UPSTREAM_HOSTS = {
+    "https://api.themoviedb.org": "tmdb",
+    "https://api.trakt.tv": "trakt",
+    "https://image.tmdb.org": "image",
+}
+
+ROUTES = [
+    ("GET", "tmdb", r"^/3/search/multi$", "tmdb_search_multi.json"),
+    ("GET", "tmdb", r"^/3/search/movie$", "tmdb_search_movie.json"),
+    ("GET", "tmdb", r"^/3/search/tv$", "tmdb_search_tv.json"),
+    ("GET", "tmdb", r"^/3/tv/\d+/external_ids$", "tmdb_tv_external_ids.json"),
+    ("GET", "tmdb", r"^/3/(movie|tv)/\d+/recommendations$", "tmdb_recommendations.json"),
+    ("GET", "tmdb", r"^/3/tv/\d+/season/\d+$", "tmdb_season.json"),
+    ("GET", "tmdb", r"^/3/tv/\d+$", "tmdb_tv.json"),
+    ("GET", "tmdb", r"^/3/movie/\d+$", "tmdb_movie.json"),
+    ("GET", "trakt", r"^/users/[^/]+/lists/[^/]+/items$", "trakt_latest_releases.json"),
+    ("GET", "riven", r"^/items$", "riven_items.json"),
+    ("GET", "riven", r"^/items/\d+$", "riven_item.json"),
+    ("GET", "riven", r"^/stats$", "riven_stats.json"),
+    ("POST", "riven", r"^/items/(add|retry|reset)$", {"success": True, "ids": [101]}),
+    ("DELETE", "riven", r"^/items/remove$", {"success": True, "ids": [101]}),
+]
+
+
+def _fake_poster(width=500, height=750):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color=(90, 60, 120)).save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+class _StubServer(ThreadingHTTPServer):
+    # Parallel poster downloads overflow the default backlog of 5 and stall on 1s SYN retries.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubUpstreams:
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit_ratio=0.0, seed=None, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.random = random.Random(seed)
+        self.calls = Counter()
+        self._fixtures = {}
+        self._poster = None
+        self._lock = threading.Lock()
+        self._server = _StubServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self):
+        with self._lock:
+            self.calls.clear()
+
+    def _fixture(self, name):
+        if name not in self._fixtures:
+            with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+                self._fixtures[name] = f.read()
+        return self._fixtures[name]
+
+    def _poster_bytes(self):
+        with self._lock:
+            if self._poster is None:
+                self._poster = _fake_poster()
+            return self._poster
+
+    def respond(self, method, path):
+        """Return (status, content_type, body) for a request to the stub."""
+        upstream, _, rest = path.lstrip("/").partition("/")
+        rest = "/" + rest
+        with self._lock:
+            self.calls[upstream] += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            limited = self.random.random() < self.rate_limit_ratio
+        if delay:
+            time.sleep(delay)
+        if limited:
+            return 429, "application/json", b'{"status_message": "Rate limited"}'
+        if upstream == "image":
+            return 200, "image/jpeg", self._poster_bytes()
+        for route_method, route_upstream, pattern, fixture in ROUTES:
+            if route_method == method and route_upstream == upstream and re.match(pattern, rest):
+                if isinstance(fixture, dict):
+                    return 200, "application/json", json.dumps(fixture).encode()
+                return 200, "application/json", self._fixture(fixture)
+        return 404, "application/json", b'{"detail": "No fixture for this route"}'
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, content_type, body = stub.respond(self.command, urlsplit(self.path).path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _reply
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def route_requests_to(base_url):
+    """Redirect `requests` calls for TMDB, Trakt and TMDB images to the stub server.
+
+    Returns a callable that restores the original behaviour.
+    """
+    import requests
+
+    original = requests.sessions.Session.request
+
+    def request(session, method, url, *args, **kwargs):
+        for origin, prefix in UPSTREAM_HOSTS.items():
+            if url.startswith(origin):
+                url = f"{base_url}/{prefix}{url[len(origin):]}"
+                break
+        return original(session, method, url, *args, **kwargs)
+
+    requests.sessions.Session.request = request
+
+    def restore():
+        requests.sessions.Session.request = original
+
+    return restore
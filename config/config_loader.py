@@ -1,15 +1,112 @@
+import asyncio
 import json
 import logging
+import os
 from core.logging_setup import logger
 logger = logging.getLogger(__name__)
 
-def load_config():
+CONFIG_PATH = "./data/config.json"
+REQUIRED_KEYS = ["discord_bot_token", "bot_prefix", "riven_api_url", "riven_api_token", "tmdb_api_key", "whitelist"]
+
+def load_config(path=CONFIG_PATH):
     try:
-        with open("./data/config.json", "r") as f:
+        with open(path, "r") as f:
             logger.info("Loading config.json")
             config = json.load(f)
             logger.info("Config loaded successfully")
             return config
     except (FileNotFoundError, json.JSONDecodeError) as e:
         logger.error(f"Failed to load config.json: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def validate_config(config):
+    if not isinstance(config, dict):
+        raise ValueError("config.json must contain a JSON object")
+    missing = [key for key in REQUIRED_KEYS if key not in config]
+    if missing:
+        raise ValueError(f"Missing required config keys: {', '.join(missing)}")
+    if not isinstance(config["whitelist"], list):
+        raise ValueError("whitelist must be a list of user IDs or usernames")
+
+def split_whitelist(entries):
+    """Split whitelist entries into a set of user IDs and a set of legacy usernames."""
+    ids, names = set(), set()
+    for entry in entries:
+        if isinstance(entry, int) or (isinstance(entry, str) and entry.isdigit()):
+            ids.add(int(entry))
+        else:
+            names.add(str(entry))
+    return ids, names
+
+class ConfigService:
+    """Owns the live config dict and reloads it when config.json changes.
+
+    The dict is updated in place, so every module holding a reference (bot.config,
+    views, snapshots) sees new values. A file that fails to parse or validate is
+    logged and ignored, and the previous config stays in effect.
+    """
+
+    def __init__(self, path=CONFIG_PATH):
+        self.path = path
+        self.config = load_config(path)
+        validate_config(self.config)
+        self._whitelist = split_whitelist(self.config["whitelist"])
+        self._mtime = self._current_mtime()
+        self._listeners = []
+        if self._whitelist[1]:
+            logger.info("Whitelist contains usernames; user IDs are preferred and survive username changes")
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def is_authorized(self, user):
+        ids, names = self._whitelist
+        return user.id in ids or (bool(names) and str(user) in names)
+
+    def on_reload(self, callback):
+        self._listeners.append(callback)
+
+    def _read(self):
+        try:
+            new_config = load_config(self.path)
+            validate_config(new_config)
+            return new_config
+        except (OSError, ValueError) as e:
+            logger.error(f"Config reload rejected, keeping previous config: {e}")
+            return None
+
+    def _apply(self, new_config):
+        whitelist = split_whitelist(new_config["whitelist"])
+        # New and changed keys are written before stale ones are dropped, so required keys never disappear.
+        self.config.update(new_config)
+        for key in set(self.config) - set(new_config):
+            del self.config[key]
+        self._whitelist = whitelist
+        for callback in self._listeners:
+            try:
+                callback(self.config)
+            except Exception as e:
+                logger.error(f"Config reload listener {callback.__name__} failed: {e}")
+        logger.info("Config reloaded")
+
+    def reload(self):
+        new_config = self._read()
+        if new_config is None:
+            return False
+        self._apply(new_config)
+        return True
+
+    async def watch(self):
+        """Poll config.json's modification time and reload it when it changes."""
+        while True:
+            await asyncio.sleep(self.config.get("config_reload_interval", 5))
+            mtime = await asyncio.to_thread(self._current_mtime)
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                # File I/O happens off the loop; the swap and listeners run on it.
+                new_config = await asyncio.to_thread(self._read)
+                if new_config is not None:
+                    self._apply(new_config)
@@ -0,0 +1,240 @@
+import asyncio
+import functools
+from collections import deque
+from discord.ext import commands
+from core.logging_setup import logger
+from core.metrics import registry
+from helpers.response import defer_once
+
+ADMISSIONS = registry.counter("rivbot_admissions_total", "Commands and callbacks admitted, by whether they had to queue.")
+ADMISSION_QUEUE = registry.gauge("rivbot_admission_queue_depth", "Requests waiting for admission.")
+
+# Relative cost of a command or callback; anything not listed costs 1.
+DEFAULT_COSTS = {
+    "latestreleases": 6,
+    "scrape": 5,
+    "bulk": 4,
+    "search": 2,
+    "recentlyadded": 2,
+    "logs": 2,
+}
+
+
+class QueueFull(commands.CheckFailure):
+    """Raised from the before-invoke hook when the user already has too many requests waiting."""
+
+
+class Ticket:
+    def __init__(self, user_id, guild_id, name, cost):
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.name = name
+        self.cost = cost
+        self.admitted = asyncio.get_running_loop().create_future()
+        self.position = 0
+        self.released = False
+
+
+class AdmissionController:
+    """Fair admission for expensive work, with per-user and per-guild cost budgets.
+
+    Every request carries a cost. A request runs when the total cost in flight,
+    its user's cost in flight and its guild's cost in flight all stay within
+    their budgets. Otherwise it waits in a per-user queue, and users are served
+    round-robin, so one user's backlog cannot starve everyone else. Each user
+    can have at most `max_queued` requests waiting.
+    """
+
+    def __init__(self, capacity=12, user_budget=5, guild_budget=8, costs=None, max_queued=3):
+        self.capacity = capacity
+        self.user_budget = user_budget
+        self.guild_budget = guild_budget
+        self.costs = dict(DEFAULT_COSTS, **(costs or {}))
+        self.max_queued = max_queued
+        self._in_flight = 0
+        self._by_user = {}
+        self._by_guild = {}
+        self._waiting = {}
+        self._rotation = deque()
+
+    def cost_of(self, name, guild_id=None):
+        """The cost of `name`, capped at the smallest budget that applies so it can always fit."""
+        budgets = [self.capacity, self.user_budget] + ([self.guild_budget] if guild_id is not None else [])
+        return min([self.costs.get(name, 1)] + budgets)
+
+    def reconfigure(self, capacity, user_budget, guild_budget, costs=None, max_queued=3):
+        """Apply new budgets, re-capping waiting tickets and admitting any that now fit."""
+        self.capacity = capacity
+        self.user_budget = user_budget
+        self.guild_budget = guild_budget
+        self.costs = dict(DEFAULT_COSTS, **(costs or {}))
+        self.max_queued = max_queued
+        for queue in self._waiting.values():
+            for ticket in queue:
+                ticket.cost = self.cost_of(ticket.name, ticket.guild_id)
+        self._dispatch()
+
+    def _fits(self, ticket):
+        return (
+            self._in_flight + ticket.cost <= self.capacity
+            and self._by_user.get(ticket.user_id, 0) + ticket.cost <= self.user_budget
+            and (ticket.guild_id is None or self._by_guild.get(ticket.guild_id, 0) + ticket.cost <= self.guild_budget)
+        )
+
+    def _admit(self, ticket):
+        self._in_flight += ticket.cost
+        self._by_user[ticket.user_id] = self._by_user.get(ticket.user_id, 0) + ticket.cost
+        if ticket.guild_id is not None:
+            self._by_guild[ticket.guild_id] = self._by_guild.get(ticket.guild_id, 0) + ticket.cost
+        ticket.admitted.set_result(True)
+
+    def _dispatch(self):
+        progressed = True
+        while progressed and self._rotation:
+            progressed = False
+            for _ in range(len(self._rotation)):
+                user_id = self._rotation[0]
+                self._rotation.rotate(-1)
+                queue = self._waiting[user_id]
+                if self._fits(queue[0]):
+                    self._admit(queue.popleft())
+                    if not queue:
+                        del self._waiting[user_id]
+                        self._rotation.remove(user_id)
+                    progressed = True
+                    break
+        ADMISSION_QUEUE.set(sum(len(queue) for queue in self._waiting.values()))
+
+    def _position(self, ticket):
+        """Estimated place in line under round-robin service, starting at 1."""
+        mine = self._waiting[ticket.user_id]
+        index = mine.index(ticket)
+        others = sum(min(len(queue), index + 1) for user_id, queue in self._waiting.items() if user_id != ticket.user_id)
+        return index + 1 + others
+
+    def request(self, user_id, guild_id, name):
+        """Queue a request; the ticket is admitted immediately when it is its turn and fits.
+
+        Returns None when the user already has `max_queued` requests waiting.
+        """
+        if len(self._waiting.get(user_id, ())) >= self.max_queued:
+            ADMISSIONS.inc(outcome="rejected")
+            logger.info(f"Rejected {name} for user {user_id}: {self.max_queued} requests already queued")
+            return None
+        ticket = Ticket(user_id, guild_id, name, self.cost_of(name, guild_id))
+        if user_id not in self._waiting:
+            self._waiting[user_id] = deque()
+            self._rotation.append(user_id)
+        self._waiting[user_id].append(ticket)
+        self._dispatch()
+        if not ticket.admitted.done():
+            ticket.position = self._position(ticket)
+            logger.info(f"Queued {name} for user {user_id} at position {ticket.position}")
+        ADMISSIONS.inc(outcome="queued" if ticket.position else "immediate")
+        return ticket
+
+    async def wait(self, ticket):
+        try:
+            await ticket.admitted
+        except asyncio.CancelledError:
+            self.cancel(ticket)
+            raise
+
+    def cancel(self, ticket):
+        """Withdraw a ticket that is still waiting, or release one that was admitted."""
+        queue = self._waiting.get(ticket.user_id)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._waiting[ticket.user_id]
+                self._rotation.remove(ticket.user_id)
+            ticket.admitted.cancel()
+            self._dispatch()
+        elif ticket.admitted.done() and not ticket.admitted.cancelled():
+            self.release(ticket)
+
+    def release(self, ticket):
+        if ticket.released:
+            return
+        ticket.released = True
+        self._in_flight -= ticket.cost
+        self._by_user[ticket.user_id] -= ticket.cost
+        if not self._by_user[ticket.user_id]:
+            del self._by_user[ticket.user_id]
+        if ticket.guild_id is not None:
+            self._by_guild[ticket.guild_id] -= ticket.cost
+            if not self._by_guild[ticket.guild_id]:
+                del self._by_guild[ticket.guild_id]
+        self._dispatch()
+
+
+admission = AdmissionController()
+
+
+def queued_message(ticket):
+    return f"⏳ Busy right now, your request is queued (#{ticket.position})."
+
+
+def queue_full_message():
+    return f"⛔ You already have {admission.max_queued} requests waiting; try again once they finish."
+
+
+async def admit_command(ctx):
+    """Hold a command until there is room for it, telling the user their place in line.
+
+    Call from a before-invoke hook and pair with release_command.
+    """
+    ticket = admission.request(ctx.author.id, ctx.guild.id if ctx.guild else None, ctx.command.qualified_name)
+    if ticket is None:
+        await ctx.send(queue_full_message(), ephemeral=True)
+        raise QueueFull(queue_full_message())
+    ctx.admission_ticket = ticket
+    if not ticket.position:
+        return
+    try:
+        # A queued slash command still has to be acknowledged within 3 seconds.
+        await defer_once(ctx)
+        await ctx.send(queued_message(ticket), ephemeral=True)
+        await admission.wait(ticket)
+    except BaseException:
+        # After-invoke hooks don't run when a before-invoke hook fails.
+        release_command(ctx)
+        raise
+
+
+def release_command(ctx):
+    """Give back the command's admission ticket; safe to call more than once."""
+    ticket = getattr(ctx, "admission_ticket", None)
+    if ticket is not None:
+        ctx.admission_ticket = None
+        admission.cancel(ticket)
+
+
+def admitted(name):
+    """Run a view callback through the admission controller under the cost of `name`.
+
+    When the callback has to wait, the interaction is deferred and the user is
+    told their place in line, so callbacks must check response.is_done() before
+    deferring themselves.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, interaction, *args, **kwargs):
+            if interaction.user.id != self.initiator_id:
+                # Let the callback reject other users without spending a slot.
+                return await func(self, interaction, *args, **kwargs)
+            guild_id = interaction.guild_id if hasattr(interaction, "guild_id") else None
+            ticket = admission.request(interaction.user.id, guild_id, name)
+            if ticket is None:
+                await interaction.response.send_message(queue_full_message(), ephemeral=True)
+                return None
+            try:
+                if ticket.position:
+                    await interaction.response.defer(ephemeral=True, thinking=True)
+                    await interaction.followup.send(queued_message(ticket), ephemeral=True)
+                    await admission.wait(ticket)
+                return await func(self, interaction, *args, **kwargs)
+            finally:
+                admission.cancel(ticket)
+        return wrapper
+    return decorator
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from core.metrics import CACHE_REQUESTS
+
+
+class TTLCache:
+    """Small in-memory LRU cache whose entries expire after a time-to-live.
+
+    Safe to share between the event loop and worker threads.
+    """
+
+    def __init__(self, name, maxsize=1024, ttl=3600):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is not None:
+                self._data.move_to_end(key)
+        if entry is None:
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return default
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Shared cache for TMDB metadata (episode lists, details) reused across views.
+metadata_cache = TTLCache("metadata", maxsize=2048, ttl=3600)
+
+# TMDB search results keyed by normalized query, including short-lived empty results.
+search_cache = TTLCache("search", maxsize=512, ttl=900)
+
+# Last Riven log download, shared by !logs invocations with different filters.
+logs_cache = TTLCache("logs", maxsize=1, ttl=15)
@@ -1,4 +1,142 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger(__name__)
\ No newline at end of file
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DEFAULT_MAX_MESSAGE_LENGTH = 2000
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "func": record.funcName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class Preview:
+    """Defers str() of a large payload until a record is actually emitted, then caps it."""
+
+    def __init__(self, payload, limit=500):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self):
+        text = self.payload if isinstance(self.payload, str) else str(self.payload)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+
+class SizeCapFilter(logging.Filter):
+    """Renders the message once and truncates it so oversized records stay cheap downstream."""
+
+    def __init__(self, max_length=DEFAULT_MAX_MESSAGE_LENGTH):
+        super().__init__()
+        self.max_length = max_length
+
+    def filter(self, record):
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            message = f"{message[:self.max_length]}... [truncated {len(message) - self.max_length} chars]"
+        record.msg, record.args = message, None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a share of DEBUG/INFO records from noisy modules.
+
+    `rates` maps a module name (e.g. "views") or logger name to the fraction
+    of records to keep. Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rates.get(record.module, self.rates.get(record.name))
+        return rate is None or random.random() < rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Keep the traceback separate from the message so JSON output can put it in its own field.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+_queue = queue.SimpleQueue()
+_size_cap = SizeCapFilter()
+_sampling = SamplingFilter()
+_queue_handler = _QueueHandler(_queue)
+_queue_handler.addFilter(_sampling)
+_queue_handler.addFilter(_size_cap)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+# Handlers run on the listener thread, so disk and console I/O stay off the event loop.
+_listener = logging.handlers.QueueListener(_queue, _console_handler, respect_handler_level=True)
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_listener.start()
+atexit.register(_listener.stop)
+
+logger = logging.getLogger(__name__)
+
+
+_applied_settings = None
+
+
+def configure_logging(config):
+    """Apply logging settings from config.json once it has been loaded.
+
+    Also runs on every config reload; it does nothing unless a `log_*` key
+    changed, and only rebuilds handlers when the format or file output did.
+    """
+    global _applied_settings
+    settings = {key: value for key, value in config.items() if key.startswith("log_")}
+    if settings == _applied_settings:
+        return
+    previous, _applied_settings = _applied_settings or {}, settings
+    handler_keys = ("log_format", "log_to_file")
+    if any(previous.get(key) != settings.get(key) for key in handler_keys):
+        formatter = JsonFormatter() if config.get("log_format") == "json" else logging.Formatter(TEXT_FORMAT)
+        handlers = [_console_handler]
+        _console_handler.setFormatter(formatter)
+        if config.get("log_to_file", False):
+            file_handler = logging.FileHandler("bot.log")
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            if handler is not _console_handler:
+                handler.close()
+        _listener.handlers = tuple(handlers)
+        _listener.start()
+        if config.get("log_to_file", False):
+            logger.info("File logging enabled; logs will be written to bot.log")
+    logging.getLogger().setLevel(config.get("log_level", "INFO"))
+    _size_cap.max_length = config.get("log_max_message_length", DEFAULT_MAX_MESSAGE_LENGTH)
+    _sampling.rates = config.get("log_sampling", {})
@@ -0,0 +1,183 @@
+import asyncio
+import functools
+import re
+import threading
+import time
+from collections import defaultdict
+from core.logging_setup import logger
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] += amount
+
+    def render(self):
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def quantile(self, q, **labels):
+        """Estimate a quantile from the bucket counts (upper bucket bound)."""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if not series or not series["count"]:
+                return None
+            target = q * series["count"]
+            for bound, count in zip(self.buckets, series["counts"]):
+                if count >= target:
+                    return bound
+            return self.buckets[-1]
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', str(bound))])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+UPSTREAM_LATENCY = registry.histogram("rivbot_upstream_request_seconds", "Latency of upstream HTTP requests.")
+UPSTREAM_REQUESTS = registry.counter("rivbot_upstream_requests_total", "Upstream HTTP requests by status.")
+UPSTREAM_BYTES = registry.counter("rivbot_upstream_response_bytes_total", "Bytes received from upstreams.")
+COMMAND_LATENCY = registry.histogram("rivbot_command_seconds", "Latency of bot commands.")
+CALLBACK_LATENCY = registry.histogram("rivbot_view_callback_seconds", "Latency of view and dropdown callbacks.")
+RENDER_LATENCY = registry.histogram("rivbot_render_seconds", "Time spent rendering images.")
+CACHE_REQUESTS = registry.counter("rivbot_cache_requests_total", "Cache lookups by result.")
+LOOP_LAG = registry.gauge("rivbot_event_loop_lag_seconds", "Most recent event loop scheduling lag.")
+
+
+def endpoint_label(endpoint):
+    """Collapse IDs in a path so metric labels stay low-cardinality."""
+    return re.sub(r"/[^/]*\d[^/]*", "/:id", endpoint.strip("/"))
+
+
+def observe_upstream(upstream, endpoint, started, response=None, error=None):
+    elapsed = time.perf_counter() - started
+    status = str(response.status_code) if response is not None else type(error).__name__ if error else "unknown"
+    endpoint = endpoint_label(endpoint)
+    UPSTREAM_LATENCY.observe(elapsed, upstream=upstream, endpoint=endpoint)
+    UPSTREAM_REQUESTS.inc(upstream=upstream, endpoint=endpoint, status=status)
+    if response is not None:
+        UPSTREAM_BYTES.inc(len(response.content or b""), upstream=upstream, endpoint=endpoint)
+
+
+def instrument_callback(func):
+    """Record the latency and outcome of a view or dropdown callback."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            CALLBACK_LATENCY.observe(time.perf_counter() - started, callback=func.__qualname__, status=status)
+    return wrapper
+
+
+async def monitor_event_loop_lag(interval=1.0):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        LOOP_LAG.set(max(0.0, loop.time() - expected))
+
+
+async def start_metrics_server(host, port):
+    """Serve the registry in Prometheus text format on http://host:port/metrics."""
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=registry.render(), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import time
+import discord
+from core.logging_setup import logger
+from core.metrics import registry
+
+NOTIFICATIONS_SENT = registry.counter("rivbot_notifications_sent_total", "Notification messages delivered, by recipient kind and outcome.")
+STATE_EMOJIS = {"Completed": "✅", "Failed": "❌", "PartiallyCompleted": "🟡"}
+
+
+class SubscriptionStore:
+    """Maps Riven item IDs to the recipients that want to hear about them.
+
+    Recipients are strings: "user:<id>" for a DM, "channel:<id>" for a channel
+    post. The map is saved to a JSON file in the background when it changes;
+    with path=None it is kept in memory only.
+    """
+
+    def __init__(self, config, path="./data/subscriptions.json"):
+        self.config = config
+        self.path = path
+        self._subscriptions = {}
+        self._dirty = False
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._subscriptions = {riven_id: set(recipients) for riven_id, recipients in data.items()}
+            logger.info(f"Loaded {len(self._subscriptions)} subscriptions")
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not read subscriptions from {self.path}: {e}")
+
+    def subscribe(self, riven_id, recipient):
+        self._subscriptions.setdefault(str(riven_id), set()).add(recipient)
+        self._dirty = True
+
+    def unsubscribe(self, riven_id, recipient):
+        recipients = self._subscriptions.get(str(riven_id))
+        if recipients and recipient in recipients:
+            recipients.discard(recipient)
+            if not recipients:
+                del self._subscriptions[str(riven_id)]
+            self._dirty = True
+            return True
+        return False
+
+    def drop(self, riven_id):
+        if self._subscriptions.pop(str(riven_id), None) is not None:
+            self._dirty = True
+
+    def recipients_for(self, riven_id):
+        return set(self._subscriptions.get(str(riven_id), ()))
+
+    def subscriptions_of(self, recipient):
+        return [riven_id for riven_id, recipients in self._subscriptions.items() if recipient in recipients]
+
+    def _write(self, payload):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    async def run(self):
+        """Write the subscriptions to disk whenever they change."""
+        while self.path:
+            await asyncio.sleep(self.config.get("subscription_flush_interval", 10))
+            if self._dirty:
+                self._dirty = False
+                payload = json.dumps({riven_id: sorted(recipients) for riven_id, recipients in self._subscriptions.items()})
+                try:
+                    await asyncio.to_thread(self._write, payload)
+                except OSError as e:
+                    self._dirty = True
+                    logger.error(f"Saving subscriptions failed: {e}")
+
+
+class NotificationDispatcher:
+    """Turns Riven state changes into batched DMs and channel posts.
+
+    Each recipient's updates are held for `notification_coalesce_window`
+    seconds and then sent as one message, so a season pack completing is a
+    single notification. Sends are spaced `notification_send_interval`
+    seconds apart across all recipients to stay clear of Discord's rate limits.
+    """
+
+    def __init__(self, bot, store, config):
+        self.bot = bot
+        self.store = store
+        self.config = config
+        self._pending = {}
+        self._timers = {}
+        self._send_lock = asyncio.Lock()
+        self._next_send_at = 0.0
+
+    async def on_state_change(self, item, previous):
+        if item["state"] not in self.config.get("notify_states", ["Completed", "Failed"]):
+            return
+        recipients = self.store.recipients_for(item["id"])
+        if item["parent_id"] is not None:
+            recipients |= self.store.recipients_for(item["parent_id"])
+        channel_id = self.config.get("riven_notify_channel_id")
+        if channel_id and item["state"] == "Completed":
+            recipients.add(f"channel:{channel_id}")
+        if item["state"] == "Completed":
+            # Subscriptions are one-shot: once the item is done there is nothing left to report.
+            self.store.drop(item["id"])
+        for recipient in recipients:
+            self.enqueue(recipient, f"{STATE_EMOJIS.get(item['state'], '🔄')} {item['title']}: {item['state']}")
+
+    def enqueue(self, recipient, line):
+        self._pending.setdefault(recipient, []).append(line)
+        if recipient not in self._timers:
+            task = asyncio.create_task(self._flush_later(recipient))
+            self._timers[recipient] = task
+
+    async def _flush_later(self, recipient):
+        try:
+            await asyncio.sleep(self.config.get("notification_coalesce_window", 30))
+        finally:
+            self._timers.pop(recipient, None)
+        lines = self._pending.pop(recipient, [])
+        if lines:
+            await self.deliver(recipient, format_batch(lines))
+
+    async def _resolve(self, recipient):
+        kind, _, raw_id = recipient.partition(":")
+        target_id = int(raw_id)
+        if kind == "user":
+            return self.bot.get_user(target_id) or await self.bot.fetch_user(target_id)
+        return self.bot.get_channel(target_id) or await self.bot.fetch_channel(target_id)
+
+    async def deliver(self, recipient, content):
+        kind = recipient.partition(":")[0]
+        async with self._send_lock:
+            delay = self._next_send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_send_at = time.monotonic() + self.config.get("notification_send_interval", 1.0)
+        try:
+            target = await self._resolve(recipient)
+            await target.send(content)
+            NOTIFICATIONS_SENT.inc(kind=kind, outcome="ok")
+        except (discord.Forbidden, discord.NotFound) as e:
+            # Closed DMs or deleted channels will not recover; stop notifying them.
+            NOTIFICATIONS_SENT.inc(kind=kind, outcome="unreachable")
+            logger.warning(f"Dropping unreachable notification recipient {recipient}: {e}")
+            for riven_id in self.store.subscriptions_of(recipient):
+                self.store.unsubscribe(riven_id, recipient)
+        except (discord.HTTPException, ValueError) as e:
+            NOTIFICATIONS_SENT.inc(kind=kind, outcome="error")
+            logger.error(f"Notification to {recipient} failed: {e}")
+
+
+def format_batch(lines, limit=2000):
+    if len(lines) == 1:
+        return lines[0]
+    header = f"**{len(lines)} Riven updates:**"
+    body = []
+    length = len(header)
+    for idx, line in enumerate(lines):
+        if length + len(line) + 40 > limit:
+            body.append(f"...and {len(lines) - idx} more")
+            break
+        body.append(line)
+        length += len(line) + 1
+    return "\n".join([header] + body)
@@ -1,41 +1,54 @@
 import requests
-from core.logging_setup import logger
+from core.logging_setup import logger, Preview
 import asyncio
+import time
+from core.metrics import observe_upstream
 
 def handle_api_response(response):
     if "error" in response:
         return None, response["error"]
     return response, None
 
-async def health_check(config):
+def fetch_riven_health(config):
     health_url = f"{config['riven_api_url']}/health"
     headers = {"Authorization": f"Bearer {config['riven_api_token']}"}
     logger.info(f"Checking Riven health at {health_url}")
+    started = time.perf_counter()
     try:
-        response = requests.get(health_url, headers=headers)
+        response = requests.get(health_url, headers=headers, timeout=config.get("riven_timeout", 10))
+        observe_upstream("riven", "health", started, response=response)
         response.raise_for_status()
         logger.info("Riven API is healthy")
-        return "Riven is up and running!"
+        return {"message": "Riven is up and running!"}
     except requests.RequestException as e:
         logger.error(f"Health check failed: {e}")
-        return f"Health check failed: {e}"
+        return {"error": f"Health check failed: {e}"}
+
+async def health_check(config):
+    result = await asyncio.to_thread(fetch_riven_health, config)
+    return result.get("message") or result["error"]
 
 def query_riven_api(endpoint, config, method="GET", params=None, json_data=None):
     url = f"{config['riven_api_url']}/{endpoint}"
     headers = {"x-api-key": config["riven_api_token"]}
-    logger.info(f"Querying Riven API: {method} {url} with params={params}, json={json_data}")
+    logger.info("Querying Riven API: %s %s with params=%s, json=%s", method, url, params, Preview(json_data))
+    started = time.perf_counter()
+    response = None
     try:
         if method == "GET":
-            response = requests.get(url, headers=headers, params=params)
+            response = requests.get(url, headers=headers, params=params, timeout=config.get("riven_timeout", 10))
         elif method == "POST":
             response = requests.post(url, headers=headers, params=params, json=json_data)
         elif method == "DELETE":
             response = requests.delete(url, headers=headers, params=params)
+        observe_upstream("riven", endpoint, started, response=response)
         response.raise_for_status()
         data = response.json()
-        logger.info(f"Riven API response: {data}")
+        logger.debug("Riven API response: %s", Preview(data))
         return data
     except requests.RequestException as e:
+        if response is None:
+            observe_upstream("riven", endpoint, started, error=e)
         error_msg = f"API error: {e}"
         logger.error(f"Riven API failed for {endpoint}: {error_msg}")
         return {"error": error_msg}
@@ -0,0 +1,170 @@
+import asyncio
+import hmac
+import ipaddress
+from core.logging_setup import logger
+from core.metrics import registry
+from core.riven_api import query_riven_api
+
+# States an item can still move out of; polling pages through these.
+ACTIVE_STATES = ["Unknown", "Unreleased", "Ongoing", "Requested", "Indexed", "Scraped", "Downloaded", "Symlinked", "PartiallyCompleted", "Failed", "Paused"]
+# Items that reach these states are no longer tracked.
+TERMINAL_STATES = {"Completed"}
+
+RIVEN_EVENTS = registry.counter("rivbot_riven_events_total", "Riven item state changes seen, by source and new state.")
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def normalize_event(payload):
+    """Turn a webhook body or an `items` entry into a flat item dict, or None if it names no item."""
+    item = payload.get("item", payload) if isinstance(payload, dict) else None
+    if not isinstance(item, dict):
+        return None
+    riven_id = item.get("id", item.get("item_id"))
+    if riven_id is None:
+        return None
+    state = item.get("state") or item.get("last_state")
+    if not state and str(payload.get("event_type", "")).lower() in ("completed", "item_completed"):
+        state = "Completed"
+    return {
+        "id": riven_id,
+        "title": item.get("title", "Unknown"),
+        "type": item.get("type"),
+        "state": state,
+        "tmdb_id": item.get("tmdb_id"),
+        "imdb_id": item.get("imdb_id"),
+        "parent_id": item.get("parent_id"),
+    }
+
+
+class RivenEventListener:
+    """Keeps a riven_id -> state map current without per-user polling.
+
+    Riven can push events to a small local HTTP receiver (`riven_webhook_port`,
+    POST /riven/events with a JSON item or list of items). Without a webhook,
+    one shared poll runs every `riven_poll_interval` seconds and only changed
+    states are reported. It reads the newest items plus every item in an
+    active state, and looks up tracked items that left the active states.
+    Items are forgotten once they reach a terminal state. Listeners
+    registered with `on_change` are awaited as `callback(item, previous_state)`.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.states = {}
+        self._listeners = []
+        self._primed = False
+
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+    async def handle(self, payload, source):
+        item = normalize_event(payload)
+        if item is None or not item["state"]:
+            return False
+        previous = self.states.get(item["id"])
+        self.states[item["id"]] = item["state"]
+        if source == "webhook" and item["state"] in TERMINAL_STATES:
+            # Pushed events arrive once per change, so finished items need no memory.
+            del self.states[item["id"]]
+        if previous == item["state"]:
+            return False
+        RIVEN_EVENTS.inc(source=source, state=item["state"])
+        logger.info(f"Riven item {item['id']} ({item['title']}) is now {item['state']} (was {previous})")
+        for callback in self._listeners:
+            try:
+                await callback(item, previous)
+            except Exception as e:
+                logger.error(f"Riven event listener {callback.__name__} failed: {e}")
+        return True
+
+    async def _list_items(self, params, max_pages):
+        page_size = self.config.get("riven_poll_limit", 50)
+        items = []
+        for page in range(1, max_pages + 1):
+            query = {**params, "limit": page_size, "page": page, "type": "movie,show"}
+            data = await asyncio.to_thread(query_riven_api, "items", self.config, params=query)
+            if "error" in data:
+                return data
+            batch = data.get("items", [])
+            items.extend(batch)
+            if len(batch) < page_size:
+                break
+        return items
+
+    async def poll_once(self):
+        newest = await self._list_items({"sort": "date_desc"}, 1)
+        active = await self._list_items({"states": ",".join(self.config.get("riven_poll_states", ACTIVE_STATES))}, self.config.get("riven_poll_max_pages", 10))
+        for result in (newest, active):
+            if isinstance(result, dict):
+                logger.warning(f"Riven event poll failed: {result['error']}")
+                return
+        seen = {item["id"]: item for item in newest + active if item.get("id") is not None}
+        # Tracked items missing from both lists have left the active states; fetch them to learn where they went.
+        for riven_id in [riven_id for riven_id in self.states if riven_id not in seen]:
+            data = await asyncio.to_thread(query_riven_api, f"items/{riven_id}", self.config)
+            if "error" in data:
+                self.states.pop(riven_id, None)
+            else:
+                seen[riven_id] = data
+        if not self._primed:
+            # The first poll only learns current states; nothing has changed yet.
+            self.states.update({riven_id: item.get("state") for riven_id, item in seen.items()})
+            self._primed = True
+        else:
+            for item in seen.values():
+                await self.handle(item, "poll")
+        # Terminal items are kept only while the newest page still lists them, so they aren't reported again.
+        newest_ids = {item.get("id") for item in newest}
+        for riven_id in [riven_id for riven_id, state in self.states.items() if state in TERMINAL_STATES and riven_id not in newest_ids]:
+            del self.states[riven_id]
+
+    async def poll(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Riven event poll crashed: {e}")
+            await asyncio.sleep(self.config.get("riven_poll_interval", 60))
+
+    async def start_webhook_server(self, host, port):
+        """Accept Riven events on http://host:port/riven/events.
+
+        Posted events announce state changes to channels and subscribers, so a
+        receiver reachable from other hosts must require `riven_webhook_secret`.
+        Raises ValueError when it is missing.
+        """
+        if not self.config.get("riven_webhook_secret") and not is_loopback(host):
+            raise ValueError(f"riven_webhook_secret is required to listen on {host}")
+        from aiohttp import web
+
+        async def handle_events(request):
+            secret = self.config.get("riven_webhook_secret")
+            token = request.headers.get("X-Riven-Token") or request.query.get("token", "")
+            # Compared as bytes: compare_digest raises TypeError on non-ASCII str input.
+            if secret and not hmac.compare_digest(token.encode(), secret.encode()):
+                return web.Response(status=401)
+            try:
+                payload = await request.json()
+            except ValueError:
+                return web.Response(status=400, text="Expected a JSON body")
+            events = payload if isinstance(payload, list) else [payload]
+            changed = 0
+            for event in events:
+                changed += await self.handle(event, "webhook")
+            return web.json_response({"received": len(events), "changed": changed})
+
+        app = web.Application()
+        app.router.add_post("/riven/events", handle_events)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Riven event receiver listening on http://{host}:{port}/riven/events")
+        return runner
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from core.logging_setup import logger
+from core.riven_api import query_riven_api, fetch_riven_health
+
+
+class SnapshotEntry:
+    def __init__(self, data, fetched_at, stale=False, error=None):
+        self.data = data
+        self.fetched_at = fetched_at
+        self.stale = stale
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    def footer(self):
+        """Discord-rendered 'last updated' line for replies built from this entry."""
+        line = f"Last updated <t:{int(self.fetched_at)}:R>"
+        if self.stale:
+            line += f" ⚠️ Riven unreachable, showing cached data ({self.error})"
+        return line
+
+
+class RivenSnapshot:
+    """Shared, short-lived copies of Riven's stats, services and health responses.
+
+    Every caller within `ttl` seconds gets the same response, concurrent misses
+    share a single request, and a background loop keeps recently used
+    endpoints warm. If a refresh fails, the last good response is served
+    (marked stale) for up to `max_stale` seconds, except for health, which
+    must report the failure.
+    """
+
+    FETCHERS = {
+        "stats": lambda config: query_riven_api("stats", config),
+        "services": lambda config: query_riven_api("services", config),
+        "health": fetch_riven_health,
+    }
+    # Endpoints whose last good response is never replayed after a failure.
+    NEVER_STALE = {"health"}
+
+    def __init__(self, config, ttl=15, max_stale=600, idle_after=300):
+        self.config = config
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.idle_after = idle_after
+        self._entries = {}
+        self._last_used = {}
+        self._inflight = {}
+
+    async def get(self, name):
+        self._last_used[name] = time.monotonic()
+        entry = self._entries.get(name)
+        # Failed refreshes count as checks too, so an unreachable Riven is retried once per TTL.
+        if entry and time.monotonic() - entry.checked_at < self.ttl:
+            return entry
+        return await self.refresh(name)
+
+    def invalidate(self, name):
+        """Make the next get() fetch fresh data, e.g. after Riven reported a change."""
+        entry = self._entries.get(name)
+        if entry:
+            entry.checked_at = 0
+
+    async def refresh(self, name):
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(name))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, name):
+        data = await asyncio.to_thread(self.FETCHERS[name], self.config)
+        previous = self._entries.get(name)
+        if "error" in data and name not in self.NEVER_STALE:
+            # Stale entries still hold the last good response; error-only entries do not.
+            has_data = previous is not None and (previous.error is None or previous.stale)
+            if has_data and time.time() - previous.fetched_at < self.max_stale:
+                logger.warning(f"Riven {name} refresh failed, serving cached copy: {data['error']}")
+                previous.stale, previous.error = True, data["error"]
+                previous.checked_at = time.monotonic()
+                return previous
+        entry = SnapshotEntry(data, time.time(), error=data.get("error"))
+        self._entries[name] = entry
+        return entry
+
+    async def run(self):
+        """Refresh endpoints that were used recently, once per TTL."""
+        while True:
+            await asyncio.sleep(self.ttl)
+            now = time.monotonic()
+            for name, last_used in list(self._last_used.items()):
+                if now - last_used < self.idle_after:
+                    try:
+                        await self.refresh(name)
+                    except Exception as e:
+                        logger.error(f"Background refresh of Riven {name} failed: {e}")
@@ -0,0 +1,31 @@
+import time
+from core.logging_setup import logger
+
+
+class RivenStateIndex:
+    """States from a Riven `items/{id}` payload, keyed by (season, episode).
+
+    Season-level states are stored under (season, None). The payload is walked
+    once when the index is built so every later lookup is a dict access.
+    """
+
+    def __init__(self, data):
+        self.fetched_at = time.monotonic()
+        self.error = data.get("error")
+        self.item_state = data.get("state", "Unknown")
+        self.states = {}
+        for season in data.get("seasons", []) or []:
+            season_num = season.get("number")
+            self.states[(season_num, None)] = season.get("state", "Unknown")
+            for episode in season.get("episodes", []) or []:
+                self.states[(season_num, episode.get("number"))] = episode.get("state", "Unknown")
+        logger.debug(f"Built Riven state index with {len(self.states)} entries")
+
+    def is_stale(self, max_age):
+        return time.monotonic() - self.fetched_at > max_age
+
+    def season_state(self, season_num):
+        return self.states.get((season_num, None))
+
+    def episode_state(self, season_num, episode_num):
+        return self.states.get((season_num, episode_num))
@@ -0,0 +1,103 @@
+import importlib.abc
+import os
+import sys
+import time
+
+# Taken when this module is first imported, which bot.py does before anything heavy.
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Records named startup phases and reports them once the bot is online."""
+
+    def __init__(self, started=PROCESS_STARTED):
+        self.started = started
+        self.phases = []
+        self.reported = False
+
+    def mark(self, name):
+        self.phases.append((name, time.perf_counter()))
+
+    def summary(self):
+        parts = []
+        previous = self.started
+        for name, at in self.phases:
+            parts.append(f"{name}={(at - previous) * 1000:.0f}ms")
+            previous = at
+        total = (previous - self.started) * 1000
+        return f"Startup took {total:.0f}ms ({', '.join(parts)})"
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profiler, name):
+        self.loader = loader
+        self.profiler = profiler
+        self.name = name
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.profiler._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self.profiler._stack.pop()
+            if self.profiler._stack:
+                self.profiler._stack[-1] += elapsed
+            self.profiler.timings[self.name] = (elapsed, elapsed - children)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Times every module import (inclusive and self time) while installed.
+
+    Enabled by setting RIVBOT_PROFILE_IMPORTS=1 before starting the bot.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._stack = []
+        self._finding = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self, fullname)
+                    return spec
+            return None
+        finally:
+            self._finding.discard(fullname)
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def report(self, top=15):
+        rows = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        lines = [f"Import profile (top {len(rows)} by inclusive time):"]
+        for name, (inclusive, own) in rows:
+            lines.append(f"  {inclusive * 1000:8.1f}ms  self {own * 1000:7.1f}ms  {name}")
+        return "\n".join(lines)
+
+
+def profile_imports_from_env():
+    if os.environ.get("RIVBOT_PROFILE_IMPORTS") == "1":
+        return ImportProfiler().install()
+    return None
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from core.logging_setup import logger
+from core.metrics import registry
+
+LOOP_STALLS = registry.counter("rivbot_event_loop_stalls_total", "Event loop stalls by blocking call site.")
+LOOP_STALL_SECONDS = registry.histogram("rivbot_event_loop_stall_seconds", "Duration of detected event loop stalls.",
+                                        buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _attribute(frames):
+    """Return 'path:function' for the innermost frame that belongs to this project."""
+    for frame in reversed(frames):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(PROJECT_ROOT) and "site-packages" not in filename and filename != os.path.abspath(__file__):
+            return f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.name}"
+    return "unknown"
+
+
+class LoopWatchdog:
+    """Detects callbacks that hold the event loop and reports where they were blocked.
+
+    A coroutine on the loop refreshes a heartbeat every `interval` seconds. A
+    daemon thread checks the heartbeat; when it is older than `threshold` the
+    loop thread's current stack is captured, logged once per stall and counted
+    in the metrics registry under the blocking call site.
+    """
+
+    def __init__(self, threshold=0.5, interval=0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._stopped = threading.Event()
+
+    async def run(self):
+        self._loop_thread_id = threading.get_ident()
+        thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        thread.start()
+        try:
+            while True:
+                self._heartbeat = time.monotonic()
+                await asyncio.sleep(self.interval)
+        finally:
+            self._stopped.set()
+
+    def _watch(self):
+        stall_site = None
+        stall_started = None
+        while not self._stopped.wait(self.interval):
+            lag = time.monotonic() - self._heartbeat
+            if lag < self.threshold:
+                if stall_site is not None:
+                    duration = time.monotonic() - stall_started
+                    LOOP_STALL_SECONDS.observe(duration, site=stall_site)
+                    logger.warning(f"Event loop stall at {stall_site} ended after {duration:.2f}s")
+                    stall_site = None
+                continue
+            if stall_site is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)
+            stall_site = _attribute(frames)
+            stall_started = self._heartbeat
+            LOOP_STALLS.inc(site=stall_site)
+            logger.warning(
+                f"Event loop blocked for {lag:.2f}s at {stall_site}; stack:\n"
+                + "".join(traceback.format_list(frames[-15:]))
+            )
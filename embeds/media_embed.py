@@ -1,4 +1,13 @@
 import discord
+from helpers.reactions import RECOMMENDATION_EMOJIS
+
+def format_recommended_titles(recommended_data, media_type):
+    title_key = "title" if media_type == "movie" else "name"
+    date_key = "release_date" if media_type == "movie" else "first_air_date"
+    return [
+        f"{RECOMMENDATION_EMOJIS[i]} {item.get(title_key, 'Unknown')} ({(item.get(date_key) or 'N/A')[:4]}) - ★ {item.get('vote_average', 'N/A')}/10"
+        for i, item in enumerate(recommended_data)
+    ]
 
 def create_media_embed(query, title, year, rating, vote_count, description, imdb_id, tmdb_id, poster, riven_state, recommended_titles=None):
     embed = discord.Embed(title=f"🔎 Results for '{query}'")
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from core.logging_setup import logger
+from core.riven_api import query_riven_api
+from tmdb.details import fetch_tmdb_by_id
+
+# action -> (endpoint, method, query parameter that takes comma-separated IDs)
+BULK_ACTIONS = {
+    "add": ("items/add", "POST", "imdb_ids"),
+    "retry": ("items/retry", "POST", "ids"),
+    "reset": ("items/reset", "POST", "ids"),
+}
+BULK_VERBS = {"add": "Adding", "retry": "Retrying", "reset": "Resetting"}
+
+
+class BulkResult:
+    def __init__(self, action, total):
+        self.action = action
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.errors = []
+        self.ids = []
+
+    @property
+    def processed(self):
+        return self.succeeded + self.failed
+
+    def summary(self):
+        text = f"{BULK_VERBS[self.action]} {self.total} items: {self.succeeded} ok, {self.failed} failed"
+        if self.processed < self.total:
+            text += f", {self.total - self.processed} pending"
+        if self.errors:
+            text += f"\nLast error: {self.errors[-1]}"
+        return text
+
+
+def chunked(ids, size):
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+async def run_bulk_action(action, ids, config, progress=None):
+    """Send `ids` to Riven's multi-ID endpoint for `action` in batches.
+
+    Up to `bulk_concurrency` batches of `bulk_batch_size` IDs are in flight at
+    once. `progress(result)` is awaited as batches finish, at most once per
+    `bulk_progress_interval` seconds.
+    """
+    endpoint, method, param = BULK_ACTIONS[action]
+    result = BulkResult(action, len(ids))
+    semaphore = asyncio.Semaphore(config.get("bulk_concurrency", 3))
+    interval = config.get("bulk_progress_interval", 1.5)
+    last_progress = time.monotonic()
+
+    async def send(batch):
+        nonlocal last_progress
+        async with semaphore:
+            response = await asyncio.to_thread(query_riven_api, endpoint, config, method, params={param: ",".join(map(str, batch))})
+        if "error" in response:
+            result.failed += len(batch)
+            result.errors.append(response["error"])
+        else:
+            result.succeeded += len(batch)
+            result.ids.extend(response.get("ids", []))
+        if progress and result.processed < result.total and time.monotonic() - last_progress >= interval:
+            last_progress = time.monotonic()
+            await progress(result)
+
+    await asyncio.gather(*(send(batch) for batch in chunked(list(ids), config.get("bulk_batch_size", 50))))
+    logger.info(f"Bulk {action}: {result.succeeded}/{result.total} ok in {len(result.errors)} failed batches")
+    return result
+
+
+def collect_riven_ids(config, state, limit=None, page_size=100):
+    """Return the IDs of every Riven item in `state`, following pagination."""
+    ids = []
+    page = 1
+    while True:
+        data = query_riven_api("items", config, params={"states": state, "limit": page_size, "page": page, "type": "movie,show"})
+        if "error" in data:
+            return data
+        items = data.get("items", [])
+        ids.extend(item["id"] for item in items if item.get("id") is not None)
+        if len(items) < page_size or (limit and len(ids) >= limit):
+            break
+        page += 1
+    return ids[:limit] if limit else ids
+
+
+async def resolve_imdb_ids(results, config):
+    """Look up IMDb IDs for (name, year, rating, tmdb_id, media_type) results; returns (imdb_ids, missing_names)."""
+    semaphore = asyncio.Semaphore(config.get("bulk_concurrency", 3))
+
+    async def lookup(result):
+        async with semaphore:
+            return await asyncio.to_thread(fetch_tmdb_by_id, result[3], result[4], config)
+
+    details = await asyncio.gather(*(lookup(result) for result in results))
+    imdb_ids, missing = [], []
+    for result, item in zip(results, details):
+        if item and item[3] and item[3] != "N/A":
+            imdb_ids.append(item[3])
+        else:
+            missing.append(result[0])
+    return imdb_ids, missing
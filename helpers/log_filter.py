@@ -0,0 +1,87 @@
+import re
+from collections import deque
+from datetime import datetime, timedelta
+
+LEVELS = ["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"]
+_LEVEL_RE = re.compile(r"\b(" + "|".join(LEVELS) + r")\b")
+_TIME_RE = re.compile(r"(\d{2,4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})")
+_DURATION_RE = re.compile(r"^(\d+)([smhd])$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_log_args(args):
+    """Parse `!logs` arguments such as `level=error since=30m limit=100 offset=0 some text`."""
+    options = {"level": None, "since": None, "limit": 50, "offset": 0, "text": None}
+    words = []
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        key = key.lower()
+        if not sep or key not in options or key == "text":
+            words.append(arg)
+        elif key == "level":
+            if value.upper() not in LEVELS:
+                raise ValueError(f"Unknown level '{value}'. Use one of: {', '.join(LEVELS)}")
+            options["level"] = value.upper()
+        elif key == "since":
+            match = _DURATION_RE.match(value.lower())
+            if not match:
+                raise ValueError("since must look like 30s, 15m, 2h or 1d")
+            options["since"] = timedelta(**{_DURATION_UNITS[match.group(2)]: int(match.group(1))})
+        else:
+            if not value.isdigit():
+                raise ValueError(f"{key} must be a number")
+            options[key] = int(value)
+    if words:
+        options["text"] = " ".join(words)
+    return options
+
+
+def extract_log_lines(data):
+    """Riven returns logs either as one text blob or as a list of lines."""
+    logs = data.get("logs", data) if isinstance(data, dict) else data
+    if isinstance(logs, str):
+        return logs.splitlines()
+    if isinstance(logs, list):
+        return [line if isinstance(line, str) else str(line) for line in logs]
+    return [str(logs)]
+
+
+def _parse_time(line):
+    match = _TIME_RE.search(line)
+    if not match:
+        return None
+    date, clock = match.groups()
+    fmt = "%Y-%m-%d %H:%M:%S" if len(date) == 10 else "%y-%m-%d %H:%M:%S"
+    try:
+        return datetime.strptime(f"{date} {clock}", fmt)
+    except ValueError:
+        return None
+
+
+def filter_log_lines(lines, level=None, text=None, since=None, limit=50, offset=0, now=None):
+    """Return the last `limit` matching lines, skipping the newest `offset` matches.
+
+    Lines without their own level or timestamp (e.g. traceback continuations)
+    inherit them from the line above. Only `limit + offset` lines are held at once.
+    """
+    min_level = LEVELS.index(level) if level else None
+    cutoff = (now or datetime.now()) - since if since else None
+    needle = text.lower() if text else None
+    window = deque(maxlen=limit + offset)
+    current_level, current_time = None, None
+    for line in lines:
+        level_match = _LEVEL_RE.search(line)
+        if level_match:
+            current_level = level_match.group(1)
+        line_time = _parse_time(line)
+        if line_time:
+            current_time = line_time
+        if min_level is not None and (current_level is None or LEVELS.index(current_level) < min_level):
+            continue
+        if cutoff and (current_time is None or current_time < cutoff):
+            continue
+        if needle and needle not in line.lower():
+            continue
+        window.append(line)
+    matches = list(window)
+    return matches[:len(matches) - offset] if offset else matches
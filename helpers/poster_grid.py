@@ -1,69 +1,159 @@
+import asyncio
 import io
 import math
-from PIL import Image, ImageOps
+import time
 import requests
 from concurrent.futures import ThreadPoolExecutor
 from core.logging_setup import logger
-async def create_poster_grid(poster_info):
+from core.metrics import observe_upstream, RENDER_LATENCY
+
+# Discord accepts at most 10 attachments per message.
+MAX_IMAGES = 10
+CAPTION_HEIGHT = 30
+PLACEHOLDER_COLOR = (50, 50, 50)
+BACKGROUND_COLOR = (0, 0, 0)
+
+
+def compute_layout(count, max_width, cell_width, cell_height, captions=True, gap=4, max_height=2400, max_images=4):
+    """Work out how `count` posters are split across images.
+
+    Columns are as many uniform cells as fit in `max_width`; rows per image are
+    capped so no image is taller than `max_height`. The result is a plain dict
+    so it can be handed to a rendering worker.
     """
-    Create a poster grid image.
+    cell_width = min(cell_width, max_width)
+    caption_height = CAPTION_HEIGHT if captions else 0
+    row_height = cell_height + caption_height + gap
+    columns = max(1, (max_width + gap) // (cell_width + gap))
+    max_rows = max(1, (max_height + gap) // row_height)
+    rows_needed = math.ceil(count / columns) if count else 0
+    per_image = columns * min(max_rows, max(rows_needed, 1))
+    images = min(math.ceil(count / per_image) if count else 0, max(1, min(max_images, MAX_IMAGES)))
+    return {
+        "columns": columns,
+        "cell_width": cell_width,
+        "cell_height": cell_height,
+        "caption_height": caption_height,
+        "gap": gap,
+        "per_image": per_image,
+        "images": images,
+        "shown": min(count, per_image * images),
+    }
+
+
+def layout_from_config(config, count):
+    return compute_layout(
+        count,
+        config["max_grid_width"],
+        config["poster_image_width"],
+        config["poster_image_height"],
+        captions=config.get("poster_grid_captions", True),
+        gap=config.get("poster_grid_gap", 4),
+        max_height=config.get("max_grid_height", 2400),
+        max_images=config.get("max_grid_images", 4),
+    )
+
+
+def _download(url):
+    started = time.perf_counter()
+    try:
+        r = requests.get(url, timeout=10)
+        observe_upstream("tmdb_image", "poster", started, response=r)
+        return r.content if r.status_code == 200 else None
+    except Exception as e:
+        observe_upstream("tmdb_image", "poster", started, error=e)
+        logger.error(f"Error fetching poster from {url}: {e}")
+        return None
+
 
-    If `resize_grid` is True, images are resized to fixed width/height and arranged in a grid.
-    If False, original image sizes are preserved, and a best-fit grid is calculated.
+def fetch_poster_bytes(urls, workers=8):
+    """Download posters concurrently; missing or failed posters come back as None."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda url: _download(url) if url else None, urls))
+
+
+def _caption(info):
+    rating = info.get("rating")
+    title = info.get("title", "")
+    if isinstance(rating, (int, float)):
+        # The default bitmap font has no star glyph, so the rating stays ASCII.
+        return f"{title} ({rating:.1f})"
+    return title
+
+
+def render_grid_images(posters, captions, layout):
+    """Render poster bytes into PNG-encoded grid images following `layout`.
+
+    Posters are decoded one at a time and pasted straight into the current
+    image, so memory is bounded by one grid image plus one poster.
     """
-    resize_grid = False  # Set to True to resize, False for original sizes
-
-    # Used only if resize_grid is True
-    IMAGE_WIDTH = 150
-    IMAGE_HEIGHT = 220
-    GRID_COLUMNS = 2
-
-    posters = []
-    placeholder_size = (IMAGE_WIDTH if resize_grid else 200, IMAGE_HEIGHT if resize_grid else 300)
-    placeholder = Image.new("RGB", placeholder_size, color=(50, 50, 50))
-
-    for info in poster_info:
-        url = info.get("poster_url")
-        if url:
-            try:
-                r = requests.get(url, timeout=10)
-                if r.status_code == 200:
-                    img = Image.open(io.BytesIO(r.content)).convert("RGB")
-                    if resize_grid:
-                        img = ImageOps.fit(img, (IMAGE_WIDTH, IMAGE_HEIGHT), Image.LANCZOS)
-                    posters.append(img)
-                else:
-                    posters.append(placeholder)
-            except Exception as e:
-                logger.error(f"Error fetching poster from {url}: {e}")
-                posters.append(placeholder)
-        else:
-            posters.append(placeholder)
-
-    total = len(posters)
-    columns = GRID_COLUMNS if resize_grid else 2  # Use fixed 2-column grid even when not resizing
-    rows = math.ceil(total / columns)
-
-    # Determine image size
-    if resize_grid:
-        img_width = IMAGE_WIDTH
-        img_height = IMAGE_HEIGHT
-    else:
-        # Use max width and height of the images to compute consistent grid spacing
-        img_width = max(img.width for img in posters)
-        img_height = max(img.height for img in posters)
+    # Pillow is the heaviest import in the bot; keep it off the startup path.
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
 
-    grid_width = columns * img_width
-    grid_height = rows * img_height
-    grid = Image.new("RGB", (grid_width, grid_height), color=(0, 0, 0))
+    cell = (layout["cell_width"], layout["cell_height"])
+    gap = layout["gap"]
+    row_height = layout["cell_height"] + layout["caption_height"] + gap
+    font = ImageFont.load_default()
+    encoded = []
+    for image_idx in range(layout["images"]):
+        start = image_idx * layout["per_image"]
+        batch = list(range(start, min(start + layout["per_image"], layout["shown"])))
+        columns = min(layout["columns"], len(batch))
+        rows = math.ceil(len(batch) / layout["columns"])
+        width = columns * (cell[0] + gap) - gap
+        height = rows * row_height - gap
+        grid = Image.new("RGB", (width, height), color=BACKGROUND_COLOR)
+        draw = ImageDraw.Draw(grid)
+        for slot, idx in enumerate(batch):
+            x = (slot % layout["columns"]) * (cell[0] + gap)
+            y = (slot // layout["columns"]) * row_height
+            poster = None
+            if posters[idx]:
+                try:
+                    poster = Image.open(io.BytesIO(posters[idx]))
+                    # Let JPEG decode at a reduced scale when the cell is much smaller than the source.
+                    poster.draft("RGB", cell)
+                    poster = ImageOps.fit(poster.convert("RGB"), cell, Image.LANCZOS)
+                except Exception as e:
+                    logger.error(f"Could not decode poster {idx}: {e}")
+                    poster = None
+            if poster is None:
+                poster = Image.new("RGB", cell, color=PLACEHOLDER_COLOR)
+            grid.paste(poster, (x, y))
+            poster.close()
+            if layout["caption_height"] and captions[idx]:
+                text = captions[idx]
+                while text and draw.textlength(text, font=font) > cell[0] - 4:
+                    text = text[:-1]
+                draw.text((x + 2, y + cell[1] + 4), text, fill=(230, 230, 230), font=font)
+        encode_started = time.perf_counter()
+        buffer = io.BytesIO()
+        grid.save(buffer, format="PNG", optimize=False, compress_level=6)
+        RENDER_LATENCY.observe(time.perf_counter() - encode_started, stage="png_encode")
+        encoded.append(buffer.getvalue())
+        grid.close()
+    return encoded
 
-    for idx, poster in enumerate(posters):
-        row = idx // columns
-        col = idx % columns
-        x = col * img_width
-        y = row * img_height
-        grid.paste(poster, (x, y))
 
-    return grid
+async def create_poster_grid(poster_info, config):
+    """Create PNG poster grid images for `poster_info` (dicts with title, poster_url and optional rating).
 
+    Returns a list of encoded images; long lists are split across several
+    images and anything beyond `max_grid_images` images is left out.
+    """
+    layout = layout_from_config(config, len(poster_info))
+    if layout["shown"] < len(poster_info):
+        logger.warning(f"Poster grid shows {layout['shown']} of {len(poster_info)} posters; raise max_grid_images to show more")
+    shown = poster_info[:layout["shown"]]
+    posters = await asyncio.to_thread(fetch_poster_bytes, [info.get("poster_url") for info in shown])
+    captions = [_caption(info) for info in shown]
+    render_started = time.perf_counter()
+    if config.get("render_backend") == "process":
+        # CPU-heavy decode/resize/encode runs in worker processes, off the GIL the gateway loop needs.
+        from helpers.render_pool import render_in_pool
 
+        images = await render_in_pool(posters, captions, layout, config.get("render_workers"))
+    else:
+        images = await asyncio.to_thread(render_grid_images, posters, captions, layout)
+    RENDER_LATENCY.observe(time.perf_counter() - render_started, stage="poster_grid")
+    return images
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from core.logging_setup import logger
+
+RECOMMENDATION_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+
+
+class ReactionManager:
+    """Keeps track of the reactions the bot has placed on each message.
+
+    Instead of clearing every reaction and re-adding them one by one, `sync`
+    only removes and adds the emojis that differ from what is already there.
+    Only the `max_messages` most recently synced messages are remembered; an
+    older message is treated as having no reactions, which at worst re-adds
+    ones that are already there.
+    """
+
+    def __init__(self, bot, max_messages=1000):
+        self.bot = bot
+        self.max_messages = max_messages
+        self._applied = OrderedDict()
+
+    def forget(self, message_id):
+        self._applied.pop(message_id, None)
+
+    async def sync(self, message, emojis):
+        current = self._applied.get(message.id, [])
+        wanted = list(emojis)
+        to_remove = [e for e in current if e not in wanted]
+        to_add = [e for e in wanted if e not in current]
+        for emoji in to_remove:
+            try:
+                await message.remove_reaction(emoji, self.bot.user)
+            except Exception as e:
+                logger.error(f"Failed to remove reaction {emoji} from message {message.id}: {e}")
+        applied = [e for e in current if e in wanted]
+        for emoji in to_add:
+            try:
+                await message.add_reaction(emoji)
+                applied.append(emoji)
+            except Exception as e:
+                logger.error(f"Failed to add reaction {emoji} to message {message.id}: {e}")
+        self._applied[message.id] = applied
+        self._applied.move_to_end(message.id)
+        while len(self._applied) > self.max_messages:
+            self._applied.popitem(last=False)
+        logger.info(f"Synced reactions on message {message.id}: +{len(to_add)} -{len(to_remove)}")
+
+    async def remove_user_reaction(self, message, emoji, user):
+        """Remove a single user's reaction so the same emoji can be picked again."""
+        try:
+            await message.remove_reaction(emoji, user)
+        except Exception as e:
+            logger.debug(f"Could not remove reaction {emoji} from {user} on message {message.id}: {e}")
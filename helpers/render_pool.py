@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from core.logging_setup import logger
+
+_pool = None
+
+
+def get_render_pool(workers=None):
+    """Return the shared rendering process pool, starting it on first use.
+
+    Workers are spawned rather than forked: by the time the first grid is
+    rendered the bot runs several threads, and a fork can copy a lock one of
+    them holds. A spawned worker imports bot.py as __mp_main__, which is why
+    bot.py is only a launcher and the bot itself lives in rivbot.py.
+    """
+    global _pool
+    if _pool is None:
+        workers = workers or min(4, os.cpu_count() or 1)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Started render pool with {workers} worker processes")
+    return _pool
+
+
+def shutdown_render_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _pack(posters):
+    """Copy poster bytes into one shared memory block; returns (block, [(start, end), ...])."""
+    total = sum(len(poster) for poster in posters if poster)
+    block = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    spans = []
+    offset = 0
+    for poster in posters:
+        if poster:
+            block.buf[offset:offset + len(poster)] = poster
+            spans.append((offset, offset + len(poster)))
+            offset += len(poster)
+        else:
+            spans.append(None)
+    return block, spans
+
+
+def _render_shared(block_name, spans, captions, layout):
+    from helpers.poster_grid import render_grid_images
+
+    # Workers share the parent's resource tracker, which tracks names as a set, so attaching adds no extra registration.
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        posters = [bytes(block.buf[span[0]:span[1]]) if span else None for span in spans]
+    finally:
+        block.close()
+    return render_grid_images(posters, captions, layout)
+
+
+async def render_in_pool(posters, captions, layout, workers=None):
+    """Render a poster grid in a worker process; poster bytes travel through shared memory."""
+    block, spans = _pack(posters)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_render_pool(workers), _render_shared, block.name, spans, captions, layout)
+    except BrokenProcessPool as e:
+        logger.error(f"Render pool failed, rendering on a thread instead: {e}")
+        shutdown_render_pool()
+        from helpers.poster_grid import render_grid_images
+
+        return await asyncio.to_thread(render_grid_images, posters, captions, layout)
+    finally:
+        block.close()
+        block.unlink()
+
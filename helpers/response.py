@@ -1,15 +1,29 @@
 import discord
+import gzip
 from core.logging_setup import logger
-from io import StringIO
+from io import BytesIO, StringIO
 
-async def send_response(ctx, content):
+COMPRESS_OVER = 256 * 1024
+
+async def defer_once(ctx):
+    """Defer a hybrid command's reply unless it was already deferred while queued for admission."""
+    if ctx.interaction is None or not ctx.interaction.response.is_done():
+        await ctx.defer()
+
+async def send_response(ctx, content, filename="output.txt", force_file=False):
+    """Send `content` inline, or as a file when it is over Discord's 2000-character limit or `force_file` is set."""
     content_str = str(content)
     logger.info(f"Sending response to {ctx.author}: {content_str[:50]}...")
-    if len(content_str) <= 2000:
+    if len(content_str) <= 2000 and not force_file:
         await ctx.send(content_str)
+    elif len(content_str) > COMPRESS_OVER:
+        file_content = BytesIO(gzip.compress(content_str.encode("utf-8")))
+        file = discord.File(file_content, filename=f"{filename}.gz")
+        await ctx.send("Output too long, here’s a compressed file:", file=file)
+        file_content.close()
     else:
         file_content = StringIO(content_str)
-        file = discord.File(file_content, filename="output.txt")
+        file = discord.File(file_content, filename=filename)
         await ctx.send("Output too long, here’s a file:", file=file)
         file_content.close()
     logger.info(f"Response sent to {ctx.author}")
@@ -0,0 +1,40 @@
+VALID_VIDEO_EXTENSIONS = (".mkv", ".avi", ".mp4")
+
+def filter_valid_files(files_dict, media_type, session_id):
+    """Keep video files large enough to be a movie or an episode."""
+    valid_files = []
+    min_size = 200 * 1024 * 1024 if media_type.lower() == "movie" else 80 * 1024 * 1024
+    for fid, file_data in files_dict.items():
+        fname = file_data.get("filename", "").lower()
+        fsize = file_data.get("bytes") or file_data.get("filesize") or 0
+        if fname.endswith(VALID_VIDEO_EXTENSIONS) and fsize >= min_size:
+            valid_files.append({
+                "session_id": session_id,
+                "file_id": fid,
+                "filename": file_data.get("filename"),
+                "filesize": fsize
+            })
+    return valid_files
+
+def build_select_files_payload(valid_files):
+    return {
+        str(idx): {
+            "file_id": f["file_id"],
+            "filename": f["filename"],
+            "filesize": f["filesize"]
+        }
+        for idx, f in enumerate(valid_files, start=1)
+    }
+
+def build_tv_update_payload(valid_files, parsed_data):
+    update_payload = {}
+    # Assume order between valid_files and parsed_data matches.
+    for f, p_item in zip(valid_files, parsed_data):
+        for season in p_item.get("seasons", []):
+            season_payload = update_payload.setdefault(str(season), {})
+            for episode in p_item.get("episodes", []):
+                season_payload[str(episode)] = {
+                    "filename": f["filename"],
+                    "filesize": f["filesize"]
+                }
+    return update_payload
@@ -0,0 +1,588 @@
+import asyncio
+import discord
+import math
+import requests
+import time
+import io
+import json
+import logging
+from discord.ext import commands
+from discord import File, Intents, app_commands
+from config.config_loader import ConfigService
+from core.startup import StartupTimer
+from core.logging_setup import logger, configure_logging
+from core.cache import logs_cache, metadata_cache, search_cache
+from core.metrics import registry, observe_upstream, monitor_event_loop_lag, start_metrics_server, COMMAND_LATENCY
+from core.watchdog import LoopWatchdog
+from core.riven_api import query_riven_api, handle_api_response
+from core.riven_snapshot import RivenSnapshot
+from core.riven_events import RivenEventListener
+from core.notifications import SubscriptionStore, NotificationDispatcher
+from core.admission import admission, admit_command, release_command
+from embeds.media_embed import create_media_embed, format_recommended_titles
+from helpers.auth import check_authorization
+from helpers.response import send_response, defer_once
+from helpers.log_filter import parse_log_args, extract_log_lines, filter_log_lines
+from helpers.bulk_actions import BULK_ACTIONS, BULK_VERBS, run_bulk_action, collect_riven_ids
+from helpers.reactions import ReactionManager, RECOMMENDATION_EMOJIS
+from helpers.render_pool import shutdown_render_pool
+from tmdb.client import tmdb_get
+from tmdb.posters import poster_size_for, poster_url as poster_url_for
+from tmdb.search import search_tmdb_extended
+from tmdb.title_index import title_index
+from tmdb.details import fetch_tmdb_by_id
+from tmdb.recommendations import fetch_tmdb_recommendations
+from ui.views import SearchView, RecentlyAddedView
+from ui.view_store import ViewStore
+
+startup_timer = StartupTimer()
+startup_timer.mark("imports")
+
+config_service = ConfigService()
+config = config_service.config
+
+configure_logging(config)
+startup_timer.mark("config")
+
+intents = Intents.default()
+# Slash commands don't need message content; without it, prefix commands only answer to mentions.
+intents.message_content = config.get("message_content_intent", True)
+intents.reactions = True
+
+def command_prefix(bot, message):
+    # The prefix is read per message so a config reload can change it.
+    if intents.message_content:
+        return config["bot_prefix"]
+    return commands.when_mentioned(bot, message)
+
+bot = commands.Bot(command_prefix=command_prefix, intents=intents)
+bot.config = config
+bot.active_recommended_messages = {}
+bot.reaction_manager = ReactionManager(bot)
+bot.background_tasks = set()
+riven_snapshot = RivenSnapshot(config)
+view_store = ViewStore(config, config.get("view_store_path", "./data/views.json"))
+riven_events = RivenEventListener(config)
+bot.subscriptions = SubscriptionStore(config, config.get("subscriptions_path", "./data/subscriptions.json"))
+notifications = NotificationDispatcher(bot, bot.subscriptions, config)
+
+
+def apply_tunables(config):
+    """Push settings that live outside the config dict into their owners."""
+    metadata_cache.maxsize = config.get("metadata_cache_size", 2048)
+    search_cache.maxsize = config.get("search_cache_size", 512)
+    riven_snapshot.ttl = config.get("snapshot_ttl", 15)
+    riven_snapshot.max_stale = config.get("snapshot_max_stale", 600)
+    admission.reconfigure(
+        capacity=config.get("admission_capacity", 12),
+        user_budget=config.get("admission_user_budget", 5),
+        guild_budget=config.get("admission_guild_budget", 8),
+        costs=config.get("command_costs", {}),
+        max_queued=config.get("admission_max_queued", 3),
+    )
+
+
+async def refresh_riven_caches(item, previous):
+    """Drop cached Riven state that an item's state change makes stale."""
+    title_index.add_riven_items([item])
+    riven_snapshot.invalidate("stats")
+    for riven_id in (item["id"], item["parent_id"]):
+        if riven_id is not None:
+            for view in view_store.views_for_riven_id(riven_id):
+                view.invalidate_riven_state()
+
+riven_events.on_change(refresh_riven_caches)
+riven_events.on_change(notifications.on_state_change)
+
+apply_tunables(config)
+config_service.on_reload(apply_tunables)
+config_service.on_reload(configure_logging)
+
+
+async def start_background_services():
+    """Start the non-essential loops once the bot is online, so they don't delay login."""
+    task = asyncio.create_task(monitor_event_loop_lag())
+    bot.background_tasks.add(task)
+    bot.background_tasks.add(asyncio.create_task(riven_snapshot.run()))
+    bot.background_tasks.add(asyncio.create_task(config_service.watch()))
+    bot.background_tasks.add(asyncio.create_task(view_store.run()))
+    bot.background_tasks.add(asyncio.create_task(bot.subscriptions.run()))
+    if config.get("loop_watchdog", True):
+        watchdog = LoopWatchdog(threshold=config.get("loop_stall_threshold", 0.5))
+        bot.background_tasks.add(asyncio.create_task(watchdog.run()))
+    if config.get("metrics_port"):
+        bot.metrics_runner = await start_metrics_server(config.get("metrics_host", "127.0.0.1"), config["metrics_port"])
+    webhook_port = config.get("riven_webhook_port")
+    if webhook_port:
+        try:
+            bot.riven_events_runner = await riven_events.start_webhook_server(config.get("riven_webhook_host", "127.0.0.1"), webhook_port)
+        except ValueError as e:
+            logger.error(f"Riven event receiver not started, polling instead: {e}")
+            webhook_port = None
+    if not webhook_port and config.get("riven_poll_interval", 60):
+        bot.background_tasks.add(asyncio.create_task(riven_events.poll()))
+    if config.get("sync_app_commands", True):
+        await sync_app_commands()
+
+async def sync_app_commands():
+    """Publish the slash commands. A configured guild gets them instantly; global sync can take an hour."""
+    try:
+        guild_id = config.get("app_command_guild_id")
+        if guild_id:
+            guild = discord.Object(id=int(guild_id))
+            bot.tree.copy_global_to(guild=guild)
+            synced = await bot.tree.sync(guild=guild)
+        else:
+            synced = await bot.tree.sync()
+        logger.info(f"Synced {len(synced)} slash commands")
+    except discord.HTTPException as e:
+        logger.error(f"Slash command sync failed: {e}")
+
+@bot.event
+async def setup_hook():
+    startup_timer.mark("login")
+    # Saved views must be registered before the gateway starts delivering interactions.
+    view_store.restore(bot)
+
+@bot.event
+async def on_ready():
+    logger.info(f"Bot online as {bot.user}")
+    # on_ready fires again after reconnects; only the first one is part of startup.
+    if not startup_timer.reported:
+        startup_timer.reported = True
+        startup_timer.mark("gateway")
+        await start_background_services()
+        startup_timer.mark("services")
+        logger.info(startup_timer.summary())
+
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.started_at = time.perf_counter()
+    await admit_command(ctx)
+
+@bot.after_invoke
+async def record_command_timer(ctx):
+    finish_command(ctx)
+
+@bot.listen("on_command_error")
+async def release_failed_command(ctx, error):
+    # Slash invocations of hybrid commands skip after-invoke hooks when the command raises.
+    finish_command(ctx)
+
+def finish_command(ctx):
+    """Release the command's admission ticket and record its latency, once per invocation."""
+    release_command(ctx)
+    started = getattr(ctx, "started_at", None)
+    if started is not None:
+        ctx.started_at = None
+        status = "error" if ctx.command_failed else "ok"
+        COMMAND_LATENCY.observe(time.perf_counter() - started, command=ctx.command.qualified_name, status=status)
+
+@bot.event
+async def on_raw_reaction_add(payload):
+    if payload.user_id == bot.user.id:
+        return
+    if payload.message_id not in bot.active_recommended_messages:
+        logger.debug(f"Reaction on untracked message {payload.message_id}")
+        return
+    view = bot.active_recommended_messages[payload.message_id]
+    if payload.user_id != view.initiator_id:
+        logger.info(f"Ignoring reaction from user {payload.user_id} (not initiator)")
+        return
+    emoji_str = payload.emoji.name
+    if emoji_str in RECOMMENDATION_EMOJIS[:len(view.recommended_ids)]:
+        # Tracked messages are edited through a partial message, so no channel or message fetch is needed.
+        channel = bot.get_partial_messageable(payload.channel_id, guild_id=payload.guild_id)
+        message = channel.get_partial_message(payload.message_id)
+        selected_index = RECOMMENDATION_EMOJIS.index(emoji_str)
+        new_tmdb_id = view.recommended_ids[selected_index]
+        new_item = fetch_tmdb_by_id(new_tmdb_id, view.media_type, bot.config)
+        if new_item:
+            view.selected_item = new_item
+            view.seasons = new_item[9] if view.media_type == "tv" else []
+            view.riven_id = None
+            view.invalidate_riven_state()
+            name, year, rating, imdb_id, tmdb_id, poster, description, vote_count, _, _ = new_item
+            logger.info(f"Reaction selected {name} (TMDB: {tmdb_id})")
+            riven_response = query_riven_api("items", bot.config, params={"search": name, "limit": 5})
+            riven_state = "Not in Riven"
+            if riven_response.get("success", False) and "items" in riven_response:
+                for item in riven_response["items"]:
+                    if item.get("tmdb_id") == str(tmdb_id) or item.get("imdb_id") == imdb_id:
+                        view.riven_id = item.get("id")
+                        riven_state = item.get("state", "Unknown")
+                        break
+            view.update_view()
+            recommended_data = fetch_tmdb_recommendations(tmdb_id, view.media_type, bot.config)
+            recommended_titles = format_recommended_titles(recommended_data, view.media_type)
+            view.recommended_ids = [item['id'] for item in recommended_data]
+            embed = create_media_embed(view.query, name, year, rating, vote_count, description, imdb_id, tmdb_id, poster, riven_state, recommended_titles)
+            await message.edit(embed=embed, view=view)
+            if payload.guild_id is not None:
+                # Only the initiator's pick is cleared; bot reactions are diffed below.
+                await bot.reaction_manager.remove_user_reaction(message, payload.emoji, discord.Object(id=payload.user_id))
+            await bot.reaction_manager.sync(message, RECOMMENDATION_EMOJIS[:len(view.recommended_ids)])
+
+@bot.hybrid_command(name="latestreleases", description="Show a poster grid of the latest releases on Trakt")
+async def latest_releases(ctx):
+    """Fetch the latest N releases from Trakt, create a full-width poster grid image, and send it as a file with an attached select menu.
+    
+    All required configuration keys must be present in config.json.
+    The message will consist solely of the image attachment and the select menu.
+    """
+    await defer_once(ctx)
+
+    # REQUIRED CONFIG KEYS – must exist in config.json (no defaults)
+    required_keys = [
+        "trakt_api_key",
+        "tmdb_api_key",
+        "latest_releases_count",
+        "max_grid_width",
+        "poster_image_width",
+        "poster_image_height"
+    ]
+    for key in required_keys:
+        if key not in config:
+            await ctx.send(f"Error: Missing required config key: `{key}`")
+            return
+
+    # Load required config values.
+    trakt_api_key = config["trakt_api_key"]
+    tmdb_api_key = config["tmdb_api_key"]
+    latest_count = config["latest_releases_count"]
+    max_grid_width = config["max_grid_width"]
+    poster_width = config["poster_image_width"]
+    poster_height = config["poster_image_height"]
+
+    trakt_url = "https://api.trakt.tv/users/garycrawfordgc/lists/latest-releases/items"
+    headers = {
+        "Content-Type": "application/json",
+        "trakt-api-version": "2",
+        "trakt-api-key": trakt_api_key
+    }
+
+    try:
+        started = time.perf_counter()
+        try:
+            response = requests.get(trakt_url, headers=headers, timeout=10)
+        except requests.exceptions.RequestException as e:
+            observe_upstream("trakt", "lists/latest-releases/items", started, error=e)
+            raise
+        observe_upstream("trakt", "lists/latest-releases/items", started, response=response)
+        response.raise_for_status()
+        items = response.json()
+
+        results = []       # For the select menu: (title, year, rating, tmdb_id, media_type)
+        poster_info = []   # For building the poster grid: dict with keys "title" and "poster_url"
+
+        for item in items[:latest_count]:
+            media_type = item.get("type")
+            if media_type == "movie":
+                media = item.get("movie", {})
+            elif media_type == "show":
+                media = item.get("show", {})
+            else:
+                continue
+
+            title = media.get("title", "Unknown")
+            year = media.get("year", "Unknown")
+            tmdb_id = media.get("ids", {}).get("tmdb")
+            rating = "N/A"   # Default rating
+            poster_url = None
+
+            if tmdb_id:
+                tmdb_response = tmdb_get(f"{'tv' if media_type=='show' else 'movie'}/{tmdb_id}", config)
+                if tmdb_response.status_code == 200:
+                    tmdb_data = tmdb_response.json()
+                    rating = tmdb_data.get("vote_average", "N/A")
+                    poster_url = poster_url_for(tmdb_data.get("poster_path"), poster_size_for(poster_width))
+            
+            logger.info(f"Fetched: {title} ({year}) with rating: {rating}")
+            results.append((title, year, rating, tmdb_id, "tv" if media_type == "show" else media_type))
+            poster_info.append({"title": title, "poster_url": poster_url, "rating": rating})
+
+        title_index.add_many(results)
+        if not results:
+            await ctx.send(f"No new releases found in the latest {latest_count} entries.")
+            return
+
+        # Create the poster grid images. Pillow is only loaded the first time this runs.
+        from helpers.poster_grid import create_poster_grid
+        images = await create_poster_grid(poster_info, config)
+        files = [discord.File(fp=io.BytesIO(data), filename=f"poster_grid_{idx + 1}.png") for idx, data in enumerate(images)]
+        view = SearchView(ctx, results, query=f"Latest {latest_count} Releases", add_all=True)
+        message = await ctx.send(files=files, view=view)
+        view_store.track(view, message)
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching latest releases from Trakt: {e}")
+        await ctx.send("Failed to retrieve latest releases. Please try again later.")
+
+@bot.command()
+async def health(ctx):
+    logger.info(f"{ctx.author} ran health")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    entry = await riven_snapshot.get("health")
+    message = entry.data.get("message") or entry.data["error"]
+    await send_response(ctx, f"{message}\n{entry.footer()}")
+
+async def merge_tmdb_results(message, view, query):
+    """Run the TMDB search behind a locally served result list and append new hits."""
+    try:
+        results = await asyncio.to_thread(search_tmdb_extended, query, config)
+    except Exception as e:
+        logger.error(f"Background TMDB search for '{query}' failed: {e}")
+        return
+    if not isinstance(results, list):
+        return
+    known = {(r[4], r[3]) for r in view.all_results}
+    new_results = [r for r in results if (r[4], r[3]) not in known]
+    if not new_results:
+        return
+    view.all_results.extend(new_results)
+    view.total_pages = math.ceil(len(view.all_results) / view.items_per_page)
+    logger.info(f"Merged {len(new_results)} new TMDB results into '{query}'")
+    if view.level == "items":
+        view.update_view()
+        await message.edit(view=view)
+
+@bot.hybrid_command(description="Search TMDB for a movie or show")
+@app_commands.describe(query="Title to search for, optionally followed by a year")
+async def search(ctx, *, query=None):
+    logger.info(f"{ctx.author} searching '{query}'")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    if not query:
+        await send_response(ctx, "Usage: {0}search <query>".format(ctx.prefix))
+        return
+    embed = discord.Embed(title=f"🔎 Results for '{query}'", description="Select an item below to view details.")
+    local_hits = title_index.search(query)
+    if local_hits and local_hits[0][0] >= config.get("local_search_min_score", 0.8):
+        # Serve known titles straight from the index and let TMDB fill in the rest.
+        logger.info(f"Serving '{query}' from the local title index ({len(local_hits)} hits)")
+        view = SearchView(ctx, [entry for _, entry in local_hits], query)
+        message = await ctx.send(embed=embed, view=view)
+        view_store.track(view, message)
+        task = asyncio.create_task(merge_tmdb_results(message, view, query))
+        bot.background_tasks.add(task)
+        task.add_done_callback(bot.background_tasks.discard)
+        return
+    # TMDB can take longer than the 3 seconds a slash command has to respond.
+    await defer_once(ctx)
+    results = await asyncio.to_thread(search_tmdb_extended, query, config)
+    if isinstance(results, dict) and "error" in results:
+        await send_response(ctx, results["error"])
+        return
+    if not results:
+        await send_response(ctx, f"No results for '{query}'")
+        return
+    view = SearchView(ctx, results, query)
+    message = await ctx.send(embed=embed, view=view)
+    view_store.track(view, message)
+
+@search.autocomplete("query")
+async def search_autocomplete(interaction, current):
+    """Suggest titles from the local index; Discord drops autocomplete answers after 3 seconds."""
+    if len(current) < 2 or not config_service.is_authorized(interaction.user):
+        return []
+    choices = []
+    for _, (name, year, _, _, media_type) in title_index.search(current, limit=25):
+        value = f"{name} {year}" if str(year).isdigit() else name
+        label = f"{name} ({year}) - {'Show' if media_type == 'tv' else 'Movie'}"
+        choices.append(app_commands.Choice(name=label[:100], value=value[:100]))
+    return choices
+
+@bot.hybrid_command(description="Browse the items most recently added to Riven")
+@app_commands.describe(n="Items per page (1-10)")
+async def recentlyadded(ctx, n: int = 5):
+    logger.info(f"{ctx.author} ran recentlyadded with n={n}")
+    if not config_service.is_authorized(ctx.author):
+        await ctx.send("You’re not authorized!")
+        return
+    if n < 1 or n > 10:
+        await ctx.send("Number must be between 1 and 10.")
+        return
+    await defer_once(ctx)
+    view = RecentlyAddedView(ctx, page_size=n)
+    content, embeds = await view.render()
+    message = await ctx.send(content, embeds=embeds, view=view)
+    view_store.track(view, message)
+
+@bot.command()
+async def bulk(ctx, action=None, *args):
+    """Add, retry or reset many items at once, e.g. `!bulk retry state=Failed`, `!bulk reset 12 13` or `!bulk add tt0903747 tt1160419`."""
+    logger.info(f"{ctx.author} ran bulk {action} {' '.join(args)}")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    usage = f"Usage: {ctx.prefix}bulk <{'|'.join(BULK_ACTIONS)}> [state=Failed] [limit=N] [ids...] (state= works with retry and reset)"
+    if action not in BULK_ACTIONS:
+        await send_response(ctx, usage)
+        return
+    ids, state, limit = [], None, None
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        if sep and key.lower() == "state":
+            state = value
+        elif sep and key.lower() == "limit" and value.isdigit():
+            limit = int(value)
+        else:
+            ids.extend(part for part in arg.split(",") if part)
+    if state and action == "add":
+        # Adding takes IMDb IDs; there are no Riven items to select by state yet.
+        await send_response(ctx, usage)
+        return
+    if state:
+        collected = await asyncio.to_thread(collect_riven_ids, config, state, limit)
+        if isinstance(collected, dict):
+            await send_response(ctx, f"Error: {collected['error']}")
+            return
+        ids.extend(collected)
+    if not ids:
+        await send_response(ctx, "No items to process.")
+        return
+    progress_msg = await ctx.send(f"{BULK_VERBS[action]} {len(ids)} items...")
+
+    async def progress(result):
+        await progress_msg.edit(content=result.summary())
+
+    result = await run_bulk_action(action, ids, config, progress)
+    await progress_msg.edit(content=result.summary())
+
+@bot.command()
+async def subscribe(ctx, riven_id: int = None, target=None):
+    """Get notified when a Riven item completes or fails: `!subscribe 123` for a DM, `!subscribe 123 here` for this channel."""
+    logger.info(f"{ctx.author} subscribing to {riven_id} ({target or 'dm'})")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    if riven_id is None:
+        await send_response(ctx, f"Usage: {ctx.prefix}subscribe <riven_id> [here]")
+        return
+    recipient = f"channel:{ctx.channel.id}" if target == "here" else f"user:{ctx.author.id}"
+    bot.subscriptions.subscribe(riven_id, recipient)
+    await send_response(ctx, f"Subscribed {'this channel' if target == 'here' else 'you'} to Riven item {riven_id}.")
+
+@bot.command()
+async def unsubscribe(ctx, riven_id: int = None, target=None):
+    logger.info(f"{ctx.author} unsubscribing from {riven_id} ({target or 'dm'})")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    if riven_id is None:
+        await send_response(ctx, f"Usage: {ctx.prefix}unsubscribe <riven_id> [here]")
+        return
+    recipient = f"channel:{ctx.channel.id}" if target == "here" else f"user:{ctx.author.id}"
+    if bot.subscriptions.unsubscribe(riven_id, recipient):
+        await send_response(ctx, f"Unsubscribed from Riven item {riven_id}.")
+    else:
+        await send_response(ctx, f"No subscription to Riven item {riven_id}.")
+
+@bot.command()
+async def subscriptions(ctx):
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    riven_ids = bot.subscriptions.subscriptions_of(f"user:{ctx.author.id}")
+    if not riven_ids:
+        await send_response(ctx, "You have no subscriptions.")
+        return
+    await send_response(ctx, f"You are subscribed to Riven items: {', '.join(riven_ids)}")
+
+@bot.hybrid_command(description="Show Riven library statistics")
+async def status(ctx):
+    logger.info(f"{ctx.author} ran status")
+    if not config_service.is_authorized(ctx.author):
+        await ctx.send("You’re not authorized!")
+        return
+    await defer_once(ctx)
+    entry = await riven_snapshot.get("stats")
+    data = entry.data
+    if "error" in data:
+        await ctx.send(f"Error: {data['error']}")
+        return
+    status_text = (
+        f"**Riven Status:**\n"
+        f"Shows: {data.get('total_shows', 0)}\n"
+        f"Movies: {data.get('total_movies', 0)}\n"
+        f"Completed: {data.get('states', {}).get('Completed', 0)}\n"
+        f"Incomplete: {data.get('incomplete_items', 0)}\n"
+        f"Failed: {data.get('states', {}).get('Failed', 0)}\n"
+        f"{entry.footer()}"
+    )
+    await ctx.send(status_text)
+
+def fetch_riven_log_lines():
+    lines = logs_cache.get("riven")
+    if lines is None:
+        data = query_riven_api("logs", config)
+        if "error" in data:
+            return data
+        lines = extract_log_lines(data)
+        logs_cache.set("riven", lines, ttl=config.get("logs_cache_ttl", 15))
+    return lines
+
+@bot.command()
+async def logs(ctx, *args):
+    """Show Riven logs, e.g. `!logs level=error since=30m limit=100 offset=0 scraper`."""
+    logger.info(f"{ctx.author} ran logs")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    try:
+        options = parse_log_args(args)
+    except ValueError as e:
+        await send_response(ctx, f"Error: {e}")
+        return
+    lines = await asyncio.to_thread(fetch_riven_log_lines)
+    if isinstance(lines, dict):
+        await send_response(ctx, f"Error: {lines['error']}")
+        return
+    matches = filter_log_lines(lines, **options)
+    if not matches:
+        await send_response(ctx, "No log lines match those filters.")
+        return
+    body = "\n".join(matches)
+    header = f"Recent Logs ({len(matches)} of {len(lines)} lines):"
+    fenced = f"{header}\n```\n{body}\n```"
+    if len(fenced) <= 2000:
+        await send_response(ctx, fenced)
+    else:
+        # The unfenced text may itself fit in a message, so the file has to be asked for.
+        await send_response(ctx, f"{header}\n{body}", filename="riven_logs.txt", force_file=True)
+
+@bot.command()
+async def services(ctx):
+    logger.info(f"{ctx.author} ran services")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    entry = await riven_snapshot.get("services")
+    data = entry.data
+    if "error" in data:
+        await send_response(ctx, f"Error: {data['error']}")
+    else:
+        services = "\n".join([f"- {s}: {'Enabled' if v else 'Disabled'}" for s, v in data.items()])
+        await send_response(ctx, f"Services:\n{services}\n{entry.footer()}")
+
+@bot.command()
+async def metrics(ctx):
+    logger.info(f"{ctx.author} ran metrics")
+    if not config_service.is_authorized(ctx.author):
+        await send_response(ctx, "You’re not authorized!")
+        return
+    await send_response(ctx, f"```\n{registry.render()}```")
+
+def main(import_profiler=None):
+    """Run the bot until it is stopped; bot.py calls this when started as a script."""
+    if import_profiler:
+        import_profiler.uninstall()
+        logger.info(import_profiler.report())
+    try:
+        # discord.py logs through the root queue handler; its own stream handler would print everything twice.
+        bot.run(config["discord_bot_token"], log_handler=None)
+    finally:
+        shutdown_render_pool()
@@ -0,0 +1,103 @@
+import asyncio
+import discord
+from types import SimpleNamespace
+from discord.ext import commands
+from core.admission import AdmissionController, admission, admit_command, release_command
+
+
+class SlashBot(commands.Bot):
+    """A bot that hands slash invocations a prepared context, so no gateway connection is needed."""
+
+    def __init__(self):
+        super().__init__(command_prefix="!", intents=discord.Intents.none())
+        self.interaction_context = None
+
+    async def get_context(self, origin, *, cls=commands.Context):
+        return self.interaction_context
+
+
+def make_bot():
+    bot = SlashBot()
+
+    @bot.before_invoke
+    async def before(ctx):
+        await admit_command(ctx)
+
+    @bot.after_invoke
+    async def after(ctx):
+        release_command(ctx)
+
+    @bot.listen("on_command_error")
+    async def on_error(ctx, error):
+        release_command(ctx)
+
+    @bot.hybrid_command(name="search")
+    async def search(ctx, query: str):
+        raise RuntimeError("TMDB is down")
+
+    return bot
+
+
+def slash_context(bot, user_id, guild_id):
+    command = bot.get_command("search")
+    interaction = SimpleNamespace(client=bot, command_failed=False, namespace=SimpleNamespace(query="alien"))
+    # Context.author and Context.guild are read from the message.
+    message = SimpleNamespace(_state=None, author=SimpleNamespace(id=user_id), guild=SimpleNamespace(id=guild_id))
+    ctx = commands.Context(message=message, bot=bot, view=None, command=command, interaction=interaction)
+    return interaction, ctx
+
+
+def test_failed_slash_command_releases_its_admission():
+    async def run():
+        async with make_bot() as bot:
+            app_command = bot.get_command("search").app_command
+            for _ in range(5):
+                interaction, bot.interaction_context = slash_context(bot, user_id=1, guild_id=10)
+                await app_command._invoke_with_namespace(interaction, None)
+                # Error listeners run as separate tasks.
+                await asyncio.sleep(0.01)
+                assert bot.interaction_context.command_failed
+                assert admission._in_flight == 0
+            assert admission._by_user == {}
+            assert admission._by_guild == {}
+
+    asyncio.run(run())
+
+
+def test_reconfigure_recaps_waiting_tickets():
+    async def run():
+        controller = AdmissionController(capacity=12, user_budget=5, guild_budget=6)
+        running = controller.request(1, 10, "scrape")
+        waiting = controller.request(1, 10, "scrape")
+        assert waiting.position == 1
+        # Lowering the budget below the queued cost must not strand the ticket.
+        controller.reconfigure(capacity=12, user_budget=3, guild_budget=6)
+        controller.release(running)
+        assert waiting.admitted.done()
+        assert waiting.cost == 3
+
+    asyncio.run(run())
+
+
+def test_raising_a_budget_admits_waiting_work():
+    async def run():
+        controller = AdmissionController(capacity=12, user_budget=5, guild_budget=4)
+        controller.request(1, 10, "scrape")
+        blocked = controller.request(2, 10, "search")
+        assert not blocked.admitted.done()
+        controller.reconfigure(capacity=12, user_budget=5, guild_budget=6)
+        assert blocked.admitted.done()
+
+    asyncio.run(run())
+
+
+def test_queue_per_user_is_capped():
+    async def run():
+        controller = AdmissionController(max_queued=2)
+        controller.request(1, None, "latestreleases")
+        assert controller.request(1, None, "search").position
+        assert controller.request(1, None, "search").position
+        assert controller.request(1, None, "search") is None
+        assert controller.request(2, None, "status") is not None
+
+    asyncio.run(run())
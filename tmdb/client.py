@@ -0,0 +1,118 @@
+import threading
+import time
+import requests
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from core.metrics import observe_upstream, registry
+
+TMDB_BASE_URL = "https://api.themoviedb.org/3"
+TMDB_HEDGES = registry.counter("rivbot_tmdb_hedged_requests_total", "Duplicate TMDB requests fired after the hedge delay, how many won, and how many were skipped because the hedge pool was busy.")
+
+# Recent TMDB latencies (seconds) for the adaptive timeout and hedge delay.
+_recent_latencies = deque(maxlen=200)
+HEDGE_WORKERS = 16
+_hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="tmdb-hedge")
+# One slot per worker, so hedged requests never wait in the pool's queue.
+_hedge_slots = threading.BoundedSemaphore(HEDGE_WORKERS)
+
+
+def recent_p95(min_samples=20):
+    samples = sorted(_recent_latencies)
+    if len(samples) < min_samples:
+        return None
+    return samples[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def adaptive_timeout(config):
+    """A timeout of `tmdb_timeout_multiplier` x recent p95, kept between `tmdb_min_timeout` and `tmdb_timeout`."""
+    ceiling = config.get("tmdb_timeout", 10)
+    p95 = recent_p95()
+    if p95 is None or not config.get("tmdb_adaptive_timeout", True):
+        return ceiling
+    return min(ceiling, max(config.get("tmdb_min_timeout", 1.0), p95 * config.get("tmdb_timeout_multiplier", 3)))
+
+
+def _get(path, url, params, timeout):
+    started = time.perf_counter()
+    try:
+        response = requests.get(url, params=params, timeout=timeout)
+    except requests.RequestException as e:
+        if isinstance(e, requests.Timeout):
+            _recent_latencies.append(timeout)
+        observe_upstream("tmdb", path, started, error=e)
+        raise
+    _recent_latencies.append(time.perf_counter() - started)
+    observe_upstream("tmdb", path, started, response=response)
+    return response
+
+
+def _submit(*args):
+    """Start _get_with_retry on an idle hedge worker; returns None when every worker is busy."""
+    if not _hedge_slots.acquire(blocking=False):
+        return None
+    future = _hedge_pool.submit(_get_with_retry, *args)
+    future.add_done_callback(lambda _: _hedge_slots.release())
+    return future
+
+
+def _get_with_retry(path, url, params, timeout, config):
+    try:
+        return _get(path, url, params, timeout)
+    except requests.Timeout:
+        # A tightened timeout gets one retry within what is left of the configured ceiling.
+        remaining = config.get("tmdb_timeout", 10) - timeout
+        if remaining < config.get("tmdb_min_timeout", 1.0):
+            raise
+        return _get(path, url, params, remaining)
+
+
+def _discard(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def tmdb_get(path, config, params=None):
+    """GET a TMDB API path with the configured API key, recording latency metrics.
+
+    The timeout adapts to recent TMDB latency; a request cut off by it is
+    retried once within the remaining `tmdb_timeout`, hedged or not. With
+    `tmdb_hedge` enabled, a request still running after the recent p95 gets a
+    duplicate, and whichever response arrives first is used. TMDB GETs are idempotent, so this only
+    costs the extra request. Hedging is skipped while every hedge worker is
+    busy, since a duplicate would only wait behind the requests it is meant
+    to overtake.
+    """
+    url = f"{TMDB_BASE_URL}/{path}"
+    request_params = {"api_key": config["tmdb_api_key"], **(params or {})}
+    timeout = adaptive_timeout(config)
+    if not config.get("tmdb_hedge", False):
+        return _get_with_retry(path, url, request_params, timeout, config)
+
+    primary = _submit(path, url, request_params, timeout, config)
+    if primary is None:
+        # Hedging under saturation would only queue more requests behind busy ones.
+        TMDB_HEDGES.inc(outcome="saturated")
+        return _get_with_retry(path, url, request_params, timeout, config)
+    p95 = recent_p95()
+    delay = max(config.get("tmdb_hedge_min_delay", 0.1), p95) if p95 else config.get("tmdb_hedge_delay", 1.0)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+    hedge = _submit(path, url, request_params, timeout, config)
+    if hedge is None:
+        TMDB_HEDGES.inc(outcome="saturated")
+        return primary.result()
+    TMDB_HEDGES.inc(outcome="fired")
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    TMDB_HEDGES.inc(outcome="won")
+                for other in pending:
+                    other.add_done_callback(_discard)
+                return future.result()
+            error = future.exception()
+    raise error
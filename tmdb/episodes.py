@@ -1,18 +1,63 @@
+import asyncio
 import requests
 import logging
 from core.logging_setup import logger
+from core.cache import metadata_cache
+from tmdb.client import tmdb_get
+
+_inflight = {}
+
+def _cache_key(tmdb_id, season_number):
+    return ("tmdb_episodes", int(tmdb_id), int(season_number))
 
 def fetch_tmdb_episodes(tmdb_id, season_number, config):
-    url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/{season_number}"
-    params = {"api_key": config["tmdb_api_key"]}
+    key = _cache_key(tmdb_id, season_number)
+    cached = metadata_cache.get(key)
+    if cached is not None:
+        logger.info(f"Episode cache hit for TMDB ID {tmdb_id}, Season {season_number}")
+        return cached
     logger.info(f"Fetching episodes for TMDB ID {tmdb_id}, Season {season_number}")
     try:
-        response = requests.get(url, params=params)
+        response = tmdb_get(f"tv/{tmdb_id}/season/{season_number}", config)
         response.raise_for_status()
         data = response.json()
         episodes = [(e["episode_number"], e["name"], e["overview"][:97] + "..." if len(e["overview"]) > 97 else e["overview"]) for e in data.get("episodes", [])]
         logger.info(f"Fetched {len(episodes)} episodes")
+        metadata_cache.set(key, episodes, ttl=config.get("metadata_cache_ttl"))
         return episodes
     except requests.RequestException as e:
         logger.error(f"Episode fetch failed: {e}")
         return {"error": str(e)}
+
+def _start_fetch(tmdb_id, season_number, config):
+    key = _cache_key(tmdb_id, season_number)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(fetch_tmdb_episodes, tmdb_id, season_number, config))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _finish_fetch(key, t))
+    return task
+
+def _finish_fetch(key, task):
+    _inflight.pop(key, None)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background episode fetch for {key} failed: {task.exception()}")
+
+async def fetch_tmdb_episodes_async(tmdb_id, season_number, config):
+    """Return a season's episodes without blocking the event loop.
+
+    Served from the metadata cache when possible; otherwise joins an in-flight
+    prefetch for the same season or starts a new fetch in a worker thread.
+    """
+    # A single get: the entry can expire between a membership test and the read.
+    cached = metadata_cache.get(_cache_key(tmdb_id, season_number))
+    if cached is not None:
+        return cached
+    return await asyncio.shield(_start_fetch(tmdb_id, season_number, config))
+
+def prefetch_tmdb_episodes(tmdb_id, season_numbers, config):
+    """Warm the metadata cache for the given seasons in the background."""
+    for season_number in dict.fromkeys(season_numbers):
+        if metadata_cache.get(_cache_key(tmdb_id, season_number)) is None:
+            logger.debug(f"Prefetching episodes for TMDB ID {tmdb_id}, Season {season_number}")
+            _start_fetch(tmdb_id, season_number, config)
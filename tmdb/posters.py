@@ -0,0 +1,35 @@
+import requests
+from core.logging_setup import logger
+from core.cache import metadata_cache
+from tmdb.client import tmdb_get
+
+TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p"
+POSTER_WIDTHS = [92, 154, 185, 342, 500, 780]
+
+def poster_size_for(width):
+    """Smallest TMDB poster size at least `width` pixels wide."""
+    return f"w{next((w for w in POSTER_WIDTHS if w >= width), POSTER_WIDTHS[-1])}"
+
+def poster_url(poster_path, size="w185"):
+    """Build a TMDB image URL; `size` is one of TMDB's poster sizes (w92 ... w780, original)."""
+    return f"{TMDB_IMAGE_BASE_URL}/{size}{poster_path}" if poster_path else None
+
+def fetch_poster_path(tmdb_id, media_type, config):
+    """Return the poster path for a title, or None. Titles without a poster are cached too."""
+    # Riven carries tmdb_id as a string, which may be empty or junk.
+    if not str(tmdb_id).isdigit():
+        return None
+    key = ("tmdb_poster", media_type, int(tmdb_id))
+    cached = metadata_cache.get(key)
+    if cached is not None:
+        return cached or None
+    try:
+        response = tmdb_get(f"{media_type}/{tmdb_id}", config)
+        response.raise_for_status()
+        poster_path = response.json().get("poster_path") or ""
+    except (requests.RequestException, ValueError, AttributeError) as e:
+        # A non-JSON error page or an unexpected body is treated as no poster.
+        logger.error(f"Poster lookup failed for {media_type} {tmdb_id}: {e}")
+        return None
+    metadata_cache.set(key, poster_path, ttl=config.get("metadata_cache_ttl"))
+    return poster_path or None
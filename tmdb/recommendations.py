@@ -0,0 +1,12 @@
+import requests
+from core.logging_setup import logger
+from tmdb.client import tmdb_get
+
+def fetch_tmdb_recommendations(tmdb_id, media_type, config, limit=5):
+    try:
+        response = tmdb_get(f"{media_type}/{tmdb_id}/recommendations", config)
+        response.raise_for_status()
+        return response.json().get("results", [])[:limit]
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch TMDB recommendations for {media_type} {tmdb_id}: {e}")
+        return []
@@ -1,78 +1,85 @@
 import re
+import unicodedata
 import requests
 import logging
 from core.logging_setup import logger
+from core.cache import search_cache
+from tmdb.client import tmdb_get
+from tmdb.title_index import title_index
 
-def search_tmdb_extended(query, config, max_pages=5):
-    api_key = config["tmdb_api_key"]
-    base_url = "https://api.themoviedb.org/3"
-    results = []
+def normalize_query(query):
+    """Split a search query into a cleaned title and an optional trailing year.
 
-    # Check if query ends with a 4-digit year
-    match = re.search(r'\b(\d{4})\b$', query.strip())
+    Unicode is NFKC-normalized and whitespace collapsed, so "Dune 2021",
+    "dune  2021" and "DUNE 2021" all produce the same cache key.
+    """
+    text = " ".join(unicodedata.normalize("NFKC", query).split())
+    match = re.match(r'^(.*\S)\s+(\d{4})$', text)
     if match:
-        year = int(match.group(1))
-        query_without_year = re.sub(r'\s*\b\d{4}\b$', '', query).strip()
-        logger.info(f"Query with year: '{query_without_year}' in {year}")
-        # Search movies with year (up to 2 pages)
-        for page in range(1, 3):
-            url = f"{base_url}/search/movie?api_key={api_key}&query={query_without_year}&year={year}&page={page}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("results", []):
-                    name = item.get("title", "Unknown")
-                    release_date = item.get("release_date", "")
-                    item_year = release_date[:4] if release_date else "N/A"
-                    rating = item.get("vote_average", "N/A")
-                    tmdb_id = item.get("id")
-                    media_type = "movie"
-                    results.append((name, item_year, rating, tmdb_id, media_type))
-                if len(data.get("results", [])) < 20:
-                    break
-            else:
-                logger.error(f"Movie search page {page} failed: {response.status_code}")
-                break
-        # Search TV shows with year (up to 2 pages)
-        for page in range(1, 3):
-            url = f"{base_url}/search/tv?api_key={api_key}&query={query_without_year}&first_air_date_year={year}&page={page}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("results", []):
-                    name = item.get("name", "Unknown")
-                    first_air_date = item.get("first_air_date", "")
-                    item_year = first_air_date[:4] if first_air_date else "N/A"
-                    rating = item.get("vote_average", "N/A")
-                    tmdb_id = item.get("id")
-                    media_type = "tv"
-                    results.append((name, item_year, rating, tmdb_id, media_type))
-                if len(data.get("results", [])) < 20:
-                    break
-            else:
-                logger.error(f"TV search page {page} failed: {response.status_code}")
+        return match.group(1), int(match.group(2))
+    return text, None
+
+def _search_pages(config, path, params, max_pages, parse_item, label):
+    results = []
+    for page in range(1, max_pages + 1):
+        try:
+            response = tmdb_get(path, config, params={**params, "page": page})
+        except requests.RequestException as e:
+            logger.error(f"{label} search page {page} failed: {e}")
+            return results, False
+        if response.status_code == 200:
+            data = response.json()
+            for item in data.get("results", []):
+                result = parse_item(item)
+                if result:
+                    results.append(result)
+            if len(data.get("results", [])) < 20:
                 break
+        else:
+            logger.error(f"{label} search page {page} failed: {response.status_code}")
+            return results, False
+    return results, True
+
+def _parse_movie(item):
+    release_date = item.get("release_date", "")
+    item_year = release_date[:4] if release_date else "N/A"
+    return (item.get("title", "Unknown"), item_year, item.get("vote_average", "N/A"), item.get("id"), "movie")
+
+def _parse_tv(item):
+    first_air_date = item.get("first_air_date", "")
+    item_year = first_air_date[:4] if first_air_date else "N/A"
+    return (item.get("name", "Unknown"), item_year, item.get("vote_average", "N/A"), item.get("id"), "tv")
+
+def _parse_multi(item):
+    if item.get("media_type") == "movie":
+        return _parse_movie(item)
+    if item.get("media_type") == "tv":
+        return _parse_tv(item)
+    return None
+
+def search_tmdb_extended(query, config, max_pages=5):
+    title, year = normalize_query(query)
+    cache_key = ("tmdb_search", title.casefold(), year, max_pages)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Search cache hit for '{query}' ({len(cached)} results)")
+        return list(cached)
+
+    if year:
+        logger.info(f"Query with year: '{title}' in {year}")
+        # Search movies and TV shows with year (up to 2 pages each)
+        movies, movies_ok = _search_pages(config, "search/movie", {"query": title, "year": year}, 2, _parse_movie, "Movie")
+        shows, shows_ok = _search_pages(config, "search/tv", {"query": title, "first_air_date_year": year}, 2, _parse_tv, "TV")
+        results = movies + shows
+        complete = movies_ok and shows_ok
     else:
         # General multi-search without year (up to max_pages, default 5)
-        for page in range(1, max_pages + 1):
-            url = f"{base_url}/search/multi?api_key={api_key}&query={query}&page={page}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("results", []):
-                    if item["media_type"] in ["movie", "tv"]:
-                        name = item.get("title" if item["media_type"] == "movie" else "name", "Unknown")
-                        date_key = "release_date" if item["media_type"] == "movie" else "first_air_date"
-                        item_year = item.get(date_key, "")[:4] if item.get(date_key) else "N/A"
-                        rating = item.get("vote_average", "N/A")
-                        tmdb_id = item.get("id")
-                        media_type = item["media_type"]
-                        results.append((name, item_year, rating, tmdb_id, media_type))
-                if len(data.get("results", [])) < 20:
-                    break
-            else:
-                logger.error(f"Multi-search page {page} failed: {response.status_code}")
-                break
+        results, complete = _search_pages(config, "search/multi", {"query": title}, max_pages, _parse_multi, "Multi")
 
     logger.info(f"Found {len(results)} TMDB results for '{query}'")
+    if complete:
+        # Empty results are remembered briefly so repeated typos don't hit TMDB again.
+        ttl = config.get("search_cache_ttl", 900) if results else config.get("search_negative_ttl", 120)
+        search_cache.set(cache_key, tuple(results), ttl=ttl)
+    title_index.add_many(results)
     return results
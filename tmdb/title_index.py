@@ -0,0 +1,124 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from core.logging_setup import logger
+
+
+def normalize_title(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """Trigram index over titles the bot has already seen.
+
+    Entries use the same tuple shape as `search_tmdb_extended` results,
+    (name, year, rating, tmdb_id, media_type), keyed by (media_type, tmdb_id).
+    Searches are fed from worker threads while the loop queries the index, so
+    every access holds a lock.
+    """
+
+    def __init__(self, max_entries=20000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._grams = {}
+        self._postings = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def add(self, name, year, rating, tmdb_id, media_type):
+        if not name or not tmdb_id or media_type not in ("movie", "tv"):
+            return
+        with self._lock:
+            self._add(name, year, rating, tmdb_id, media_type)
+
+    def _add(self, name, year, rating, tmdb_id, media_type):
+        key = (media_type, int(tmdb_id))
+        existing = self._entries.get(key)
+        if existing:
+            # Keep known values when the new source (e.g. Riven) lacks year or rating.
+            year = year if year not in (None, "", "N/A", "Unknown") else existing[1]
+            rating = rating if rating not in (None, "", "N/A") else existing[2]
+            self._unlink(key)
+        self._entries[key] = (name, year or "N/A", rating if rating is not None else "N/A", int(tmdb_id), media_type)
+        grams = _trigrams(normalize_title(name))
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._unlink(oldest)
+            del self._entries[oldest]
+
+    def add_many(self, results):
+        with self._lock:
+            for result in results:
+                self.add(*result)
+        logger.debug(f"Title index holds {len(self)} entries")
+
+    def add_riven_items(self, items):
+        with self._lock:
+            for item in items:
+                media_type = {"movie": "movie", "show": "tv"}.get(str(item.get("type", "")).lower())
+                tmdb_id = item.get("tmdb_id")
+                if media_type and tmdb_id and str(tmdb_id).isdigit():
+                    self.add(item.get("title"), None, None, tmdb_id, media_type)
+
+    def _unlink(self, key):
+        for gram in self._grams.pop(key, ()):
+            keys = self._postings.get(gram)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def search(self, query, year=None, limit=50, min_score=0.35):
+        """Return (score, result) pairs ranked best first.
+
+        A trailing four-digit year ("dune 2021") filters on release year.
+        """
+        match = re.match(r"^(.*\S)\s+(\d{4})$", query.strip())
+        if match and year is None:
+            query, year = match.group(1), match.group(2)
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+        query_grams = _trigrams(normalized)
+        overlap = defaultdict(int)
+        scored = []
+        with self._lock:
+            for gram in query_grams:
+                for key in self._postings.get(gram, ()):
+                    overlap[key] += 1
+            for key, shared in overlap.items():
+                entry = self._entries[key]
+                if year and str(entry[1]) != str(year):
+                    continue
+                score = 2 * shared / (len(query_grams) + len(self._grams[key]))
+                if normalize_title(entry[0]).startswith(normalized):
+                    score = min(1.0, score + 0.3)
+                if score >= min_score:
+                    scored.append((score, entry))
+        scored.sort(key=lambda pair: (pair[0], _as_float(pair[1][2])), reverse=True)
+        return scored[:limit]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+title_index = TitleIndex()
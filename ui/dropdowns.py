@@ -1,14 +1,20 @@
+import asyncio
 import discord
 import requests
 import logging
 from discord.ui import Select
 from discord import SelectOption
 from core.logging_setup import logger
-from embeds.media_embed import create_media_embed
+from embeds.media_embed import create_media_embed, format_recommended_titles
 from helpers.auth import check_authorization
+from helpers.reactions import RECOMMENDATION_EMOJIS
+from core.metrics import instrument_callback
 from tmdb.details import fetch_tmdb_by_id
 from core.riven_api import query_riven_api
-from tmdb.episodes import fetch_tmdb_episodes
+from tmdb.episodes import fetch_tmdb_episodes_async
+from tmdb.recommendations import fetch_tmdb_recommendations
+from tmdb.title_index import title_index
+from ui.interaction_executor import loading_embed
 
 class SearchDropdown(Select):
     def __init__(self, items, page, total_pages, dropdown_type="items", selected_value=None):
@@ -19,14 +25,17 @@ class SearchDropdown(Select):
         options = []
         max_label_length = 100  
 
-        if dropdown_type == "items":
+        if dropdown_type in ("items", "bulk_items"):
+            # For bulk_items, selected_value holds the indices already picked across all pages.
+            selected = set(selected_value or []) if dropdown_type == "bulk_items" else set()
             for idx, (name, year, rating, tmdb_id, media_type) in enumerate(items):
                 label = f"{name[:80]} ({year}) - Rating: {rating}/10"
                 if len(label) < 1:
                     label = "Invalid Label"  
                 elif len(label) > max_label_length:
                     label = label[:max_label_length]  
-                options.append(SelectOption(label=label, description=f"TMDB: {tmdb_id}", value=str(idx + (page - 1) * 10)))
+                value = idx + (page - 1) * 10
+                options.append(SelectOption(label=label, description=f"TMDB: {tmdb_id}", value=str(value), default=value in selected))
 
         elif dropdown_type == "seasons":
             for idx, (season_num, season_name, episode_count) in enumerate(items):
@@ -46,102 +55,134 @@ class SearchDropdown(Select):
                     label = label[:max_label_length]
                 options.append(SelectOption(label=label, description=ep_desc, value=str(idx + (page - 1) * 25)))
 
-        super().__init__(placeholder=f"Select {dropdown_type.capitalize()} (Page {page}/{total_pages})", options=options)
+        if dropdown_type == "bulk_items":
+            super().__init__(placeholder=f"Select items to add (Page {page}/{total_pages})", options=options, custom_id="search:bulk_items", min_values=0, max_values=len(options))
+        else:
+            super().__init__(placeholder=f"Select {dropdown_type.capitalize()} (Page {page}/{total_pages})", options=options, custom_id=f"search:{dropdown_type}")
         logger.info(f"Created {dropdown_type} dropdown with {len(options)} options")
 
+    @instrument_callback
     async def callback(self, interaction: discord.Interaction):
-        if not await check_authorization(interaction, self.view.initiator_id):
+        # update_view() detaches this dropdown from the view, so keep a reference to it.
+        view = self.view
+        if not await check_authorization(interaction, view.initiator_id):
+            return
+        if self.dropdown_type == "bulk_items":
+            # Replace this page's picks and keep the ones made on other pages.
+            page_values = {int(option.value) for option in self.options}
+            view.bulk_selection = [idx for idx in view.bulk_selection if idx not in page_values] + [int(value) for value in self.values]
+            view.update_view()
+            await interaction.response.edit_message(view=view)
             return
         selected_value = self.values[0]
         if self.dropdown_type == "items":
             selected_idx = int(selected_value) % 10
             selected_basic = self.items[selected_idx]
-            tmdb_id = selected_basic[3]
-            media_type = selected_basic[4]
-            full_item = fetch_tmdb_by_id(tmdb_id, media_type, self.view.ctx.bot.config)
-            if full_item:
-                self.view.selected_item = full_item
-                name, year, rating, imdb_id, tmdb_id, poster, description, vote_count, media_type, seasons = full_item
-                self.view.media_type = media_type
-                self.view.seasons = seasons if media_type == "tv" else []
-                self.view.level = "show" if media_type == "tv" else "movie"
-                riven_response = query_riven_api("items", self.view.ctx.bot.config, params={"search": name, "limit": 50})
-                exists_in_riven = False
+            name_hint, _, _, tmdb_id, media_type = selected_basic
+            config = view.ctx.bot.config
+
+            async def load():
+                # Details, the Riven lookup and recommendations only need what the result row already has.
+                full_item, riven_response, recommended_data = await asyncio.gather(
+                    asyncio.to_thread(fetch_tmdb_by_id, tmdb_id, media_type, config),
+                    asyncio.to_thread(query_riven_api, "items", config, params={"search": name_hint, "limit": 50}),
+                    asyncio.to_thread(fetch_tmdb_recommendations, tmdb_id, media_type, config),
+                )
+                if not full_item:
+                    return {"embed": discord.Embed(title=f"🔎 Results for '{view.query}'", description="Failed to fetch item details."), "view": view}
+                name, year, rating, imdb_id, item_tmdb_id, poster, description, vote_count, item_media_type, seasons = full_item
                 riven_id = None
-                riven_state = "Not in Riven" 
+                riven_state = "Not in Riven"
                 if riven_response.get("success", False) and "items" in riven_response:
+                    title_index.add_riven_items(riven_response["items"])
                     for item in riven_response["items"]:
-                        logger.info(f"Comparing TMDB: {item.get('tmdb_id')} vs {str(tmdb_id)}, IMDb: {item.get('imdb_id')} vs {imdb_id}")
-                        if item.get("tmdb_id") == str(tmdb_id) or item.get("imdb_id") == imdb_id:
-                            exists_in_riven = True
+                        logger.info(f"Comparing TMDB: {item.get('tmdb_id')} vs {str(item_tmdb_id)}, IMDb: {item.get('imdb_id')} vs {imdb_id}")
+                        if item.get("tmdb_id") == str(item_tmdb_id) or item.get("imdb_id") == imdb_id:
                             riven_id = item.get("id")
                             riven_state = item.get("state", "Unknown")
                             logger.info(f"Item {name} found in Riven: ID {riven_id}, State {riven_state}")
                             break
-                self.view.riven_id = riven_id
-                self.view.update_view()
-                recommended_response = requests.get(f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}/recommendations", params={"api_key": self.view.ctx.bot.config["tmdb_api_key"]})
-                recommended_data = recommended_response.json().get("results", [])[:5]
-                emoji_numbers = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
-                recommended_titles = [
-                    f"{emoji_numbers[i]} {item['title' if media_type == 'movie' else 'name']} ({item['release_date' if media_type == 'movie' else 'first_air_date'][:4]}) - ★ {item['vote_average']}/10"
-                    for i, item in enumerate(recommended_data)
-                ]
-                self.view.recommended_ids = [item['id'] for item in recommended_data]
-                embed = create_media_embed(self.view.query, name, year, rating, vote_count, description, imdb_id, tmdb_id, poster, riven_state, recommended_titles)
-                await interaction.response.edit_message(embed=embed, view=self.view)
-                message = await interaction.original_response()
-                self.view.ctx.bot.active_recommended_messages[message.id] = self.view
-                reaction_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
-                for emoji in reaction_emojis[:len(self.view.recommended_ids)]:
-                    await message.add_reaction(emoji)
-                    logger.info(f"Added reaction {emoji} to message {message.id}")
-            else:
-                await interaction.response.send_message("Failed to fetch item details.", ephemeral=True)
+                # Everything is fetched; apply it to the view in one step.
+                view.selected_item = full_item
+                view.media_type = item_media_type
+                view.seasons = seasons if item_media_type == "tv" else []
+                view.level = "show" if item_media_type == "tv" else "movie"
+                view.riven_id = riven_id
+                view.invalidate_riven_state()
+                view.update_view()
+                recommended_titles = format_recommended_titles(recommended_data, item_media_type)
+                view.recommended_ids = [item['id'] for item in recommended_data]
+                embed = create_media_embed(view.query, name, year, rating, vote_count, description, imdb_id, item_tmdb_id, poster, riven_state, recommended_titles)
+                return {"embed": embed, "view": view}
+
+            result = await view.executor.run(interaction, load, placeholder=loading_embed(view.query, name_hint))
+            if result is None or view.selected_item is None or view.selected_item[4] != tmdb_id:
                 return
+            message = interaction.message
+            view.ctx.bot.active_recommended_messages[message.id] = view
+            view.prefetch_episodes()
+            await view.ctx.bot.reaction_manager.sync(message, RECOMMENDATION_EMOJIS[:len(view.recommended_ids)])
         elif self.dropdown_type == "seasons":
             selected_idx = int(selected_value) - (self.page - 1) * 25
-            self.view.selected_season = self.items[selected_idx]
-            season_num, season_name, _ = self.view.selected_season
-            self.view.episodes = fetch_tmdb_episodes(self.view.selected_item[4], season_num, self.view.ctx.bot.config)
-            self.view.level = "episode"
-            self.view.update_view()
-            name, year, _, imdb_id, tmdb_id, poster, description, vote_count, _, _ = self.view.selected_item
-            riven_state = await self.view.get_riven_state()
-            if imdb_id != 'N/A':
-                title_display = f"[{name} ({year})](https://www.imdb.com/title/{imdb_id}/)"
-            else:
-                title_display = f"{name} ({year})"
-            media_card = (
-                f"**{title_display} - Season {season_num}: {season_name}**\n"
-                f"📝 {description}\n"
-                f"🔄 Riven: {riven_state}\n"
-            ).strip()
-            embed = discord.Embed(title=f"🔎 Results for '{self.view.query}'", description=media_card)
-            embed.set_thumbnail(url=poster)
-            embed.set_image(url=poster)
-            await interaction.response.edit_message(embed=embed, view=self.view)
+            selected_season = self.items[selected_idx]
+            season_num, season_name, _ = selected_season
+
+            async def load():
+                episodes = await fetch_tmdb_episodes_async(view.selected_item[4], season_num, view.ctx.bot.config)
+                if isinstance(episodes, dict) and "error" in episodes:
+                    await interaction.followup.send(f"Failed to fetch episodes: {episodes['error']}", ephemeral=True)
+                    return None
+                await view.load_riven_index()
+                view.selected_season = selected_season
+                view.episodes = episodes
+                view.episodes_page = 1
+                view.prefetch_episodes(around=season_num)
+                view.level = "episode"
+                view.update_view()
+                name, year, _, imdb_id, tmdb_id, poster, description, vote_count, _, _ = view.selected_item
+                riven_state = view.riven_state()
+                if imdb_id != 'N/A':
+                    title_display = f"[{name} ({year})](https://www.imdb.com/title/{imdb_id}/)"
+                else:
+                    title_display = f"{name} ({year})"
+                media_card = (
+                    f"**{title_display} - Season {season_num}: {season_name}**\n"
+                    f"📝 {description}\n"
+                    f"🔄 Riven: {riven_state}\n"
+                ).strip()
+                embed = discord.Embed(title=f"🔎 Results for '{view.query}'", description=media_card)
+                embed.set_thumbnail(url=poster)
+                embed.set_image(url=poster)
+                return {"embed": embed, "view": view}
+
+            await view.executor.run(interaction, load)
         elif self.dropdown_type == "episodes":
             selected_idx = int(selected_value) - (self.page - 1) * 25
-            self.view.selected_episode = self.items[selected_idx]
-            ep_num, ep_name, ep_desc = self.view.selected_episode
-            name, year, _, imdb_id, tmdb_id, poster, _, vote_count, _, _ = self.view.selected_item
-            season_num, season_name, _ = self.view.selected_season
-            riven_state = await self.view.get_riven_state()
-            if imdb_id != 'N/A':
-                title_display = f"[{name} ({year})](https://www.imdb.com/title/{imdb_id}/)"
-            else:
-                title_display = f"{name} ({year})"
-            media_card = (
-                f"**{title_display} - S{season_num}: {season_name} - E{ep_num}: {ep_name}**\n"
-                f"📝 {ep_desc}\n"
-                f"🔄 Riven: {riven_state}\n"
-            ).strip()
-            embed = discord.Embed(title=f"🔎 Results for '{self.view.query}'", description=media_card)
-            embed.set_thumbnail(url=poster)
-            embed.set_image(url=poster)
-            await interaction.response.edit_message(embed=embed, view=self.view)
-            
+            selected_episode = self.items[selected_idx]
+            ep_num, ep_name, ep_desc = selected_episode
+
+            async def load():
+                await view.load_riven_index()
+                view.selected_episode = selected_episode
+                name, year, _, imdb_id, tmdb_id, poster, _, vote_count, _, _ = view.selected_item
+                season_num, season_name, _ = view.selected_season
+                riven_state = view.riven_state()
+                if imdb_id != 'N/A':
+                    title_display = f"[{name} ({year})](https://www.imdb.com/title/{imdb_id}/)"
+                else:
+                    title_display = f"{name} ({year})"
+                media_card = (
+                    f"**{title_display} - S{season_num}: {season_name} - E{ep_num}: {ep_name}**\n"
+                    f"📝 {ep_desc}\n"
+                    f"🔄 Riven: {riven_state}\n"
+                ).strip()
+                embed = discord.Embed(title=f"🔎 Results for '{view.query}'", description=media_card)
+                embed.set_thumbnail(url=poster)
+                embed.set_image(url=poster)
+                return {"embed": embed, "view": view}
+
+            await view.executor.run(interaction, load)
+
 class LatestReleasesDropdown(Select):
     def __init__(self, items):
         options = []
@@ -151,17 +192,19 @@ class LatestReleasesDropdown(Select):
             label = f"{title[:80]} ({year})"
             description = f"Added: {added_date}"
             options.append(SelectOption(label=label, description=description, value=str(idx)))
-        super().__init__(placeholder="Select a release", options=options)
+        super().__init__(placeholder="Select a release", options=options, custom_id="latest:select")
 
+    @instrument_callback
     async def callback(self, interaction: discord.Interaction):
-        if not await check_authorization(interaction, self.view.initiator_id):
+        view = self.view
+        if not await check_authorization(interaction, view.initiator_id):
             return
 
         selected_idx = int(self.values[0])
-        selected_item = self.view.recent_items[selected_idx]  # Tuple: (title, year, tmdb_id, media_type, added_date)
+        selected_item = view.recent_items[selected_idx]  # Tuple: (title, year, tmdb_id, media_type, added_date)
         title, year, tmdb_id, media_type, added_date = selected_item
 
-        details = fetch_tmdb_by_id(tmdb_id, media_type, self.view.ctx.bot.config)
+        details = fetch_tmdb_by_id(tmdb_id, media_type, view.ctx.bot.config)
         if details:
             # Unpack TMDb details: (name, year, rating, imdb_id, tmdb_id, poster, description, vote_count, media_type, seasons)
             name, year, rating, imdb_id, tmdb_id, poster, description, vote_count, media_type, seasons = details
@@ -181,6 +224,6 @@ class LatestReleasesDropdown(Select):
                 embed.set_image(url=poster)
             embed.add_field(name="IMDb", value=f"[View on IMDb]({imdb_link})", inline=True)
             embed.add_field(name="Trakt", value=f"[View on Trakt]({trakt_link})", inline=True)
-            await interaction.response.edit_message(embed=embed, view=self.view)
+            await interaction.response.edit_message(embed=embed, view=view)
         else:
             await interaction.response.send_message("Failed to fetch details.", ephemeral=True)
@@ -0,0 +1,57 @@
+import asyncio
+import discord
+from core.logging_setup import logger
+from core.metrics import registry
+
+SUPERSEDED = registry.counter("rivbot_interactions_superseded_total", "View interactions whose background work was cancelled by a newer click.")
+
+
+def loading_embed(query, label):
+    return discord.Embed(title=f"🔎 Results for '{query}'", description=f"⏳ Loading {label}...")
+
+
+class InteractionExecutor:
+    """Runs a view's slow interactions without missing Discord's 3-second ack.
+
+    The interaction is acknowledged straight away (with a placeholder embed
+    when one is given), the work runs as a background task, and its result is
+    applied with a single edit. A newer interaction cancels work still running
+    for an older one, so only the latest click edits the message. Work should
+    fetch first and only change view state after its last await, so a
+    cancelled run leaves the view untouched.
+    """
+
+    def __init__(self):
+        self._task = None
+
+    async def run(self, interaction, work, placeholder=None):
+        """Ack `interaction`, await `work()` and edit the message with the dict it returns.
+
+        Returns that dict, or None when the work was superseded.
+        """
+        if placeholder is not None:
+            await interaction.response.edit_message(embed=placeholder)
+        else:
+            await interaction.response.defer()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            SUPERSEDED.inc()
+        task = asyncio.ensure_future(work())
+        self._task = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                logger.info(f"Interaction from {interaction.user} superseded by a newer one")
+                return None
+            raise
+        except Exception as e:
+            logger.error(f"Background work for {interaction.user}'s interaction failed: {e}")
+            await interaction.edit_original_response(embed=discord.Embed(description=f"❌ Something went wrong: {e}"))
+            return None
+        finally:
+            if self._task is task:
+                self._task = None
+        if result is not None:
+            await interaction.edit_original_response(**result)
+        return result
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import time
+from core.logging_setup import logger
+from ui.views import SearchView, LatestReleasesView, RecentlyAddedView
+
+VIEW_CLASSES = {"search": SearchView, "latest": LatestReleasesView, "recent": RecentlyAddedView}
+
+
+class RestoredContext:
+    """Stands in for the command context of a view rebuilt after a restart."""
+
+    def __init__(self, bot, author_id):
+        self.bot = bot
+        self.author = _Author(author_id)
+
+
+class _Author:
+    def __init__(self, author_id):
+        self.id = author_id
+
+
+class ViewStore:
+    """Keeps open views alive across restarts.
+
+    Views sent with a message are tracked here and their state is written to
+    a JSON file in the background. At startup the file is read back and every
+    view that was used within `ttl` seconds is re-registered against its
+    message, so old buttons and dropdowns keep working from the saved state.
+    """
+
+    def __init__(self, config, path="./data/views.json"):
+        self.config = config
+        self.path = path
+        self._views = {}
+        self._last_written = None
+
+    @property
+    def ttl(self):
+        return self.config.get("view_store_ttl", 7 * 24 * 3600)
+
+    def track(self, view, message):
+        view.message_id = message.id
+        self._views[message.id] = view
+        max_views = self.config.get("view_store_max", 500)
+        if len(self._views) > max_views:
+            oldest = sorted(self._views.values(), key=lambda v: v.touched_at)[:len(self._views) - max_views]
+            for stale in oldest:
+                self.forget(stale)
+
+    def views_for_riven_id(self, riven_id):
+        return [view for view in self._views.values() if getattr(view, "riven_id", None) == riven_id]
+
+    def forget(self, view):
+        self._views.pop(view.message_id, None)
+        view.ctx.bot.active_recommended_messages.pop(view.message_id, None)
+        view.ctx.bot.reaction_manager.forget(view.message_id)
+        view.stop()
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not read saved views from {self.path}: {e}")
+            return []
+
+    def restore(self, bot):
+        """Rebuild saved views and register them with the bot. Call before connecting."""
+        cutoff = time.time() - self.ttl
+        restored = 0
+        for state in self._read():
+            view_class = VIEW_CLASSES.get(state.get("kind"))
+            if view_class is None or state.get("touched_at", 0) < cutoff:
+                continue
+            try:
+                view = view_class.from_state(RestoredContext(bot, state["initiator_id"]), state)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping saved view for message {state.get('message_id')}: {e}")
+                continue
+            view.message_id = state["message_id"]
+            bot.add_view(view, message_id=view.message_id)
+            self._views[view.message_id] = view
+            if getattr(view, "recommended_ids", None):
+                bot.active_recommended_messages[view.message_id] = view
+            restored += 1
+        logger.info(f"Restored {restored} saved views")
+
+    def _write(self, payload):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    async def flush(self):
+        cutoff = time.time() - self.ttl
+        for view in list(self._views.values()):
+            if view.touched_at < cutoff or view.is_finished():
+                self.forget(view)
+        payload = json.dumps([view.to_state() for view in self._views.values()], separators=(",", ":"))
+        if payload == self._last_written:
+            return
+        await asyncio.to_thread(self._write, payload)
+        self._last_written = payload
+
+    async def run(self):
+        """Write tracked view state to disk whenever it changes."""
+        while True:
+            await asyncio.sleep(self.config.get("view_store_flush_interval", 10))
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Saving view state failed: {e}")
@@ -1,19 +1,39 @@
+import asyncio
 import discord
+import io
 import math
 import requests
+import time
 import logging
 from discord.ui import View, Button
 from discord.ui.button import ButtonStyle
-from core.logging_setup import logger
-from ui.dropdowns import SearchDropdown
+from core.logging_setup import logger, Preview
+from ui.dropdowns import SearchDropdown, LatestReleasesDropdown
 from core.riven_api import query_riven_api, handle_api_response
-from tmdb.episodes import fetch_tmdb_episodes
-from embeds.media_embed import create_media_embed
+from core.riven_state import RivenStateIndex
+from tmdb.episodes import prefetch_tmdb_episodes
+from tmdb.recommendations import fetch_tmdb_recommendations
+from tmdb.posters import fetch_poster_path, poster_url
+from tmdb.title_index import title_index
+from embeds.media_embed import create_media_embed, format_recommended_titles
 from helpers.auth import check_authorization
+from helpers.reactions import RECOMMENDATION_EMOJIS
+from helpers.bulk_actions import run_bulk_action, resolve_imdb_ids
+from core.metrics import instrument_callback
+from core.admission import admitted
+from ui.interaction_executor import InteractionExecutor, loading_embed
 
 class SearchView(View):
-    def __init__(self, ctx, all_results, query, page=1):
-        super().__init__(timeout=300)
+    # Attributes saved by to_state() so the view can be rebuilt after a restart.
+    STATE_FIELDS = [
+        "all_results", "query", "initiator_id", "page", "selected_item", "selected_season", "selected_episode",
+        "riven_id", "media_type", "level", "seasons", "episodes", "seasons_page", "episodes_page", "recommended_ids",
+        "multi_select", "bulk_selection", "add_all",
+    ]
+
+    def __init__(self, ctx, all_results, query, page=1, add_all=False):
+        # No timeout: views are persistent and expire through the view store instead.
+        super().__init__(timeout=None)
         self.ctx = ctx
         self.all_results = all_results
         self.query = query
@@ -28,8 +48,15 @@ class SearchView(View):
         self.level = "items"
         self.seasons = []
         self.episodes = []
-        self.riven_data = None
+        self.riven_index = None
         self.recommended_ids = []
+        self.multi_select = False
+        self.bulk_selection = []
+        # Curated lists such as the latest releases offer adding every result at once.
+        self.add_all = add_all
+        self.message_id = None
+        self.touched_at = time.time()
+        self.executor = InteractionExecutor()
 
         # Pagination attributes
         self.items_per_page = 10
@@ -37,51 +64,108 @@ class SearchView(View):
         self.seasons_page = 1
         self.episodes_page = 1
 
-        self.prev_button = Button(label="Previous", style=ButtonStyle.grey)
+        self.prev_button = Button(label="Previous", style=ButtonStyle.grey, custom_id="search:prev")
         self.prev_button.callback = self.prev_button_callback
-        self.next_button = Button(label="Next", style=ButtonStyle.grey)
+        self.next_button = Button(label="Next", style=ButtonStyle.grey, custom_id="search:next")
         self.next_button.callback = self.next_button_callback
-        self.add_button = Button(label="Add", style=ButtonStyle.green)
+        self.add_button = Button(label="Add", style=ButtonStyle.green, custom_id="search:add")
         self.add_button.callback = self.add_button_callback
-        self.remove_button = Button(label="Remove", style=ButtonStyle.red)
+        self.remove_button = Button(label="Remove", style=ButtonStyle.red, custom_id="search:remove")
         self.remove_button.callback = self.remove_button_callback
-        self.retry_button = Button(label="Retry", style=ButtonStyle.green)
+        self.retry_button = Button(label="Retry", style=ButtonStyle.green, custom_id="search:retry")
         self.retry_button.callback = self.retry_button_callback
-        self.reset_button = Button(label="Reset", style=ButtonStyle.blurple)
+        self.reset_button = Button(label="Reset", style=ButtonStyle.blurple, custom_id="search:reset")
         self.reset_button.callback = self.reset_button_callback
-        self.scrape_button = Button(label="Scrape", style=ButtonStyle.blurple)
+        self.scrape_button = Button(label="Scrape", style=ButtonStyle.blurple, custom_id="search:scrape")
         self.scrape_button.callback = self.scrape_button_callback
-        self.magnets_button = Button(label="Magnets", style=ButtonStyle.grey)
+        self.magnets_button = Button(label="Magnets", style=ButtonStyle.grey, custom_id="search:magnets")
         self.magnets_button.callback = self.magnets_button_callback
-        self.refresh_button = Button(label="Refresh", style=ButtonStyle.grey)
+        self.refresh_button = Button(label="Refresh", style=ButtonStyle.grey, custom_id="search:refresh")
         self.refresh_button.callback = self.refresh_button_callback
+        self.multi_button = Button(label="Select multiple", style=ButtonStyle.grey, custom_id="search:multi")
+        self.multi_button.callback = self.multi_button_callback
+        self.bulk_add_button = Button(label="Add selected", style=ButtonStyle.green, custom_id="search:bulk_add")
+        self.bulk_add_button.callback = self.bulk_add_button_callback
+        self.add_all_button = Button(label="Add all", style=ButtonStyle.green, custom_id="search:add_all")
+        self.add_all_button.callback = self.add_all_button_callback
 
         self.update_view()
         logger.info(f"SearchView initialized for '{query}' with {len(all_results)} results")
 
-    async def get_riven_state(self):
+    async def interaction_check(self, interaction: discord.Interaction):
+        self.touched_at = time.time()
+        return True
+
+    def to_state(self):
+        state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+        state.update(kind="search", message_id=self.message_id, touched_at=self.touched_at)
+        return state
+
+    @classmethod
+    def from_state(cls, ctx, state):
+        view = cls(ctx, state["all_results"], state["query"], page=state["page"])
+        for field in cls.STATE_FIELDS:
+            # Views saved before a field existed keep its default.
+            if field in state:
+                setattr(view, field, state[field])
+        view.touched_at = state["touched_at"]
+        view.update_view()
+        return view
+
+    def invalidate_riven_state(self):
+        self.riven_index = None
+
+    async def load_riven_index(self):
+        """Fetch the item's Riven state unless the cached copy is younger than `riven_state_ttl`."""
+        if not self.riven_id:
+            return
+        max_age = self.ctx.bot.config.get("riven_state_ttl", 30)
+        if self.riven_index is None or self.riven_index.is_stale(max_age):
+            data = await asyncio.to_thread(query_riven_api, f"items/{self.riven_id}", self.ctx.bot.config)
+            self.riven_index = RivenStateIndex(data)
+
+    def riven_state(self):
+        """Describe the Riven state of the current selection from the loaded index."""
         if not self.riven_id:
             return "Not in Riven"
-        if not self.riven_data:
-            self.riven_data = query_riven_api(f"items/{self.riven_id}", self.ctx.bot.config)
-        if "error" in self.riven_data:
-            logger.error(f"Riven state fetch error: {self.riven_data['error']}")
-            return f"Error: {self.riven_data['error']}"
+        if self.riven_index is None:
+            return "Unknown"
+        if self.riven_index.error:
+            logger.error(f"Riven state fetch error: {self.riven_index.error}")
+            error = self.riven_index.error
+            self.invalidate_riven_state()
+            return f"Error: {error}"
         if self.level in ["show", "movie"]:
-            return self.riven_data.get("state", "Unknown")
+            return self.riven_index.item_state
         elif self.level == "episode" and self.selected_season:
             season_num = self.selected_season[0]
-            for season in self.riven_data.get("seasons", []):
-                if season.get("number") == season_num:
-                    if self.selected_episode:
-                        ep_num = self.selected_episode[0]
-                        for episode in season.get("episodes", []):
-                            if episode.get("number") == ep_num:
-                                return episode.get("state", "Unknown")
-                    return season.get("state", "Unknown")
-            return "Season not in Riven"
+            season_state = self.riven_index.season_state(season_num)
+            if season_state is None:
+                return "Season not in Riven"
+            if self.selected_episode:
+                episode_state = self.riven_index.episode_state(season_num, self.selected_episode[0])
+                if episode_state is not None:
+                    return episode_state
+            return season_state
         return "Unknown"
 
+    async def get_riven_state(self):
+        await self.load_riven_index()
+        return self.riven_state()
+
+    def prefetch_episodes(self, around=None):
+        """Warm the episode cache for the seasons the user is likely to pick next."""
+        if self.media_type != "tv" or not self.seasons or not self.selected_item:
+            return
+        season_numbers = [season[0] for season in self.seasons]
+        if around is None:
+            candidates = [next((n for n in season_numbers if n >= 1), season_numbers[0])]
+        else:
+            candidates = [around - 1, around + 1]
+        candidates.append(max(season_numbers))
+        wanted = [n for n in candidates if n in season_numbers and n != around]
+        prefetch_tmdb_episodes(self.selected_item[4], wanted, self.ctx.bot.config)
+
     def update_view(self):
         self.clear_items()
         logger.info(f"Updating view to level '{self.level}', page {self.page}")
@@ -90,12 +174,23 @@ class SearchView(View):
             end = start + self.items_per_page
             page_results = self.all_results[start:end]
             total_items_pages = math.ceil(len(self.all_results) / self.items_per_page)
-            self.add_item(SearchDropdown(page_results, self.page, total_items_pages, "items"))
+            if self.multi_select:
+                self.add_item(SearchDropdown(page_results, self.page, total_items_pages, "bulk_items", selected_value=self.bulk_selection))
+            else:
+                self.add_item(SearchDropdown(page_results, self.page, total_items_pages, "items"))
             if total_items_pages > 1:
                 self.add_item(self.prev_button)
                 self.add_item(self.next_button)
                 self.prev_button.disabled = self.page == 1
                 self.next_button.disabled = self.page == total_items_pages
+            self.add_item(self.multi_button)
+            self.multi_button.label = "Done selecting" if self.multi_select else "Select multiple"
+            if self.multi_select:
+                self.add_item(self.bulk_add_button)
+                self.bulk_add_button.label = f"Add selected ({len(self.bulk_selection)})"
+                self.bulk_add_button.disabled = not self.bulk_selection
+            elif self.add_all:
+                self.add_item(self.add_all_button)
 
         elif self.level == "show":
             total_seasons_pages = math.ceil(len(self.seasons) / self.options_per_page)
@@ -144,6 +239,7 @@ class SearchView(View):
             self.scrape_button.disabled = not exists_in_riven
             self.magnets_button.disabled = not exists_in_riven
 
+    @instrument_callback
     async def prev_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -157,6 +253,7 @@ class SearchView(View):
         self.update_view()
         await interaction.response.edit_message(view=self)
 
+    @instrument_callback
     async def next_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -171,6 +268,7 @@ class SearchView(View):
         await interaction.response.edit_message(view=self)
 
     # The remaining button callbacks (add_button_callback, remove_button_callback, etc.) remain unchanged
+    @instrument_callback
     async def add_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -179,13 +277,19 @@ class SearchView(View):
         response, error = handle_api_response(query_riven_api("items/add", self.ctx.bot.config, "POST", params={"imdb_ids": imdb_id}))
         if error:
             await interaction.response.send_message(f"Add failed: {error}", ephemeral=True)
-        else:
-            self.riven_id = response.get("ids", [None])[0]
-            self.riven_data = None
-            await interaction.response.send_message(f"Added {name}", ephemeral=True)
+            return
+        self.riven_id = response.get("ids", [None])[0]
+        self.invalidate_riven_state()
         self.update_view()
-        await interaction.message.edit(view=self)
+        # The button state change rides on the interaction response instead of a separate message edit.
+        await interaction.response.edit_message(view=self)
+        if self.riven_id is not None:
+            self.ctx.bot.subscriptions.subscribe(self.riven_id, f"user:{interaction.user.id}")
+            await interaction.followup.send(f"Added {name}. I'll DM you when it completes.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"Added {name}", ephemeral=True)
 
+    @instrument_callback
     async def remove_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -194,13 +298,14 @@ class SearchView(View):
         response, error = handle_api_response(query_riven_api("items/remove", self.ctx.bot.config, "DELETE", params={"ids": self.riven_id}))
         if error:
             await interaction.response.send_message(f"Remove failed: {error}", ephemeral=True)
-        else:
-            self.riven_id = None
-            self.riven_data = None
-            await interaction.response.send_message(f"Removed {name}", ephemeral=True)
+            return
+        self.riven_id = None
+        self.invalidate_riven_state()
         self.update_view()
-        await interaction.message.edit(view=self)
+        await interaction.response.edit_message(view=self)
+        await interaction.followup.send(f"Removed {name}", ephemeral=True)
 
+    @instrument_callback
     async def retry_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -210,11 +315,10 @@ class SearchView(View):
         if error:
             await interaction.response.send_message(f"Retry failed: {error}", ephemeral=True)
         else:
-            self.riven_data = None
+            self.invalidate_riven_state()
             await interaction.response.send_message(f"Retrying {name}", ephemeral=True)
-        self.update_view()
-        await interaction.message.edit(view=self)
 
+    @instrument_callback
     async def reset_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -224,17 +328,21 @@ class SearchView(View):
         if error:
             await interaction.response.send_message(f"Reset failed: {error}", ephemeral=True)
         else:
-            self.riven_data = None
+            self.invalidate_riven_state()
             await interaction.response.send_message(f"Reset {name}", ephemeral=True)
-        self.update_view()
-        await interaction.message.edit(view=self)
 
+    @instrument_callback
+    @admitted("scrape")
     async def scrape_button_callback(self, interaction: discord.Interaction):
+        # Scraping is rare, so its helpers are loaded on first use rather than at startup.
+        from helpers.scrape_payloads import filter_valid_files, build_select_files_payload, build_tv_update_payload
         try:
             # Step 0: Verify authorization and defer response
             if not await check_authorization(interaction, self.initiator_id):
                 return
-            await interaction.response.defer(ephemeral=True)
+            # A queued click was already deferred while it waited for admission.
+            if not interaction.response.is_done():
+                await interaction.response.defer(ephemeral=True)
 
             if not self.riven_id:
                 await interaction.followup.send("Scrape unavailable: Title not in Riven.", ephemeral=True)
@@ -258,7 +366,7 @@ class SearchView(View):
             logger.debug(f"[Fetch Streams] URL: {streams_url}")
             streams_response = requests.get(streams_url, headers=headers, verify=False)
             logger.debug(f"[Fetch Streams] Status: {streams_response.status_code}")
-            logger.debug(f"[Fetch Streams] Body: {streams_response.text}")
+            logger.debug("[Fetch Streams] Body: %s", Preview(streams_response.text))
             if streams_response.status_code != 200:
                 await interaction.followup.send("Failed to fetch streams.", ephemeral=True)
                 return
@@ -304,7 +412,7 @@ class SearchView(View):
                 try:
                     start_resp = requests.post(start_url, headers=headers, verify=False)
                     logger.debug(f"[Start Session] Status: {start_resp.status_code}")
-                    logger.debug(f"[Start Session] Body: {start_resp.text}")
+                    logger.debug("[Start Session] Body: %s", Preview(start_resp.text))
                 except Exception as e:
                     logger.error(f"[Start Session] Exception: {e}")
                     await select_int.followup.send(f"Error starting session: {e}", ephemeral=True)
@@ -327,24 +435,12 @@ class SearchView(View):
                 logger.info(f"[Start Session] Started session with session_id: {session_id}")
 
                 torrent_info = session_data.get("torrent_info", {})
-                logger.debug(f"[Start Session] Torrent info: {torrent_info}")
+                logger.debug("[Start Session] Torrent info: %s", Preview(torrent_info))
                 files_dict = torrent_info.get("files", {})
                 logger.info(f"[Start Session] Torrent returned {len(files_dict)} file(s).")
 
                 # --- Step 4: Filter Files ---
-                valid_files = []
-                min_size = 200 * 1024 * 1024 if media_type.lower() == "movie" else 80 * 1024 * 1024
-                valid_exts = (".mkv", ".avi", ".mp4")
-                for fid, file_data in files_dict.items():
-                    fname = file_data.get("filename", "").lower()
-                    fsize = file_data.get("bytes") or file_data.get("filesize") or 0
-                    if fname.endswith(valid_exts) and fsize >= min_size:
-                        valid_files.append({
-                            "session_id": session_id,
-                            "file_id": fid,
-                            "filename": file_data.get("filename"),
-                            "filesize": fsize
-                        })
+                valid_files = filter_valid_files(files_dict, media_type, session_id)
                 logger.info(f"[File Filter] Found {len(valid_files)} valid file(s) for session {session_id}.")
                 if not valid_files:
                     await select_int.followup.send("No valid files found for this stream.", ephemeral=True)
@@ -396,7 +492,7 @@ class SearchView(View):
                                 "filesize": int(filesize_sel)
                             }
                         }
-                        logger.info(f"[Select Files] Payload (Movie): {payload}")
+                        logger.debug("[Select Files] Payload (Movie): %s", Preview(payload))
 
                         select_files_url = f"{riven_url}/scrape/scrape/select_files/{session_id_sel}"
                         logger.info(f"[Select Files] URL: {select_files_url}")
@@ -412,7 +508,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[Select Files] Status: {sf_resp.status_code}")
-                            logger.info(f"[Select Files] Body: {sf_resp.text}")
+                            logger.debug("[Select Files] Body: %s", Preview(sf_resp.text))
                         except Exception as e:
                             logger.error(f"[Select Files] Exception: {e}")
                             await file_int.followup.send(f"Error selecting file: {e}", ephemeral=True)
@@ -425,7 +521,7 @@ class SearchView(View):
                         # For movies, update attributes immediately using the same payload structure.
                         update_url = f"{riven_url}/scrape/scrape/update_attributes/{session_id_sel}"
                         logger.info(f"[Update Attributes] URL: {update_url}")
-                        logger.info(f"[Update Attributes] Payload (Movie): {payload}")
+                        logger.debug("[Update Attributes] Payload (Movie): %s", Preview(payload))
                         try:
                             up_resp = requests.post(
                                 update_url,
@@ -438,7 +534,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[Update Attributes] Status: {up_resp.status_code}")
-                            logger.info(f"[Update Attributes] Body: {up_resp.text}")
+                            logger.debug("[Update Attributes] Body: %s", Preview(up_resp.text))
                         except Exception as e:
                             logger.error(f"[Update Attributes] Exception: {e}")
                             await file_int.followup.send(f"Error updating attributes: {e}", ephemeral=True)
@@ -460,7 +556,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[Complete Session] Status: {comp_resp.status_code}")
-                            logger.info(f"[Complete Session] Body: {comp_resp.text}")
+                            logger.debug("[Complete Session] Body: %s", Preview(comp_resp.text))
                         except Exception as e:
                             logger.error(f"[Complete Session] Exception: {e}")
                             await file_int.followup.send(f"Error completing session: {e}", ephemeral=True)
@@ -492,14 +588,8 @@ class SearchView(View):
 
                     async def on_confirm(confirm_int: discord.Interaction):
                         await confirm_int.response.defer(ephemeral=True)
-                        select_files_payload = {}
-                        for idx, f in enumerate(valid_files, start=1):
-                            select_files_payload[str(idx)] = {
-                                "file_id": f["file_id"],
-                                "filename": f["filename"],
-                                "filesize": f["filesize"]
-                            }
-                        logger.info(f"[TV Select Files] Payload: {select_files_payload}")
+                        select_files_payload = build_select_files_payload(valid_files)
+                        logger.debug("[TV Select Files] Payload: %s", Preview(select_files_payload))
                         select_files_url = f"{riven_url}/scrape/scrape/select_files/{session_id}"
                         logger.info(f"[TV Select Files] URL: {select_files_url}")
                         try:
@@ -514,7 +604,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[TV Select Files] Status: {sf_resp.status_code}")
-                            logger.info(f"[TV Select Files] Body: {sf_resp.text}")
+                            logger.debug("[TV Select Files] Body: %s", Preview(sf_resp.text))
                         except Exception as e:
                             logger.error(f"[TV Select Files] Exception: {e}")
                             await confirm_int.followup.send(f"Error selecting files: {e}", ephemeral=True)
@@ -528,7 +618,7 @@ class SearchView(View):
                         filenames = [f["filename"] for f in valid_files]
                         parse_url = f"{riven_url}/scrape/parse"
                         logger.info(f"[Parse] URL: {parse_url}")
-                        logger.info(f"[Parse] Payload: {filenames}")
+                        logger.debug("[Parse] Payload: %s", Preview(filenames))
                         try:
                             parse_resp = requests.post(
                                 parse_url,
@@ -541,7 +631,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[Parse] Status: {parse_resp.status_code}")
-                            logger.info(f"[Parse] Body: {parse_resp.text}")
+                            logger.debug("[Parse] Body: %s", Preview(parse_resp.text))
                         except Exception as e:
                             logger.error(f"[Parse] Exception: {e}")
                             await confirm_int.followup.send(f"Error parsing files: {e}", ephemeral=True)
@@ -556,20 +646,8 @@ class SearchView(View):
                             return
 
                         # --- Build Update Attributes Payload ---
-                        update_payload = {}
-                        # Assume order between valid_files and parsed_data matches.
-                        for f, p_item in zip(valid_files, parsed_data):
-                            for season in p_item.get("seasons", []):
-                                season_key = str(season)
-                                if season_key not in update_payload:
-                                    update_payload[season_key] = {}
-                                for episode in p_item.get("episodes", []):
-                                    episode_key = str(episode)
-                                    update_payload[season_key][episode_key] = {
-                                        "filename": f["filename"],
-                                        "filesize": f["filesize"]
-                                    }
-                        logger.info(f"[TV Update Attributes] Payload: {update_payload}")
+                        update_payload = build_tv_update_payload(valid_files, parsed_data)
+                        logger.debug("[TV Update Attributes] Payload: %s", Preview(update_payload))
 
                         update_url = f"{riven_url}/scrape/scrape/update_attributes/{session_id}"
                         logger.info(f"[TV Update Attributes] URL: {update_url}")
@@ -585,7 +663,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[TV Update Attributes] Status: {up_resp.status_code}")
-                            logger.info(f"[TV Update Attributes] Body: {up_resp.text}")
+                            logger.debug("[TV Update Attributes] Body: %s", Preview(up_resp.text))
                         except Exception as e:
                             logger.error(f"[TV Update Attributes] Exception: {e}")
                             await confirm_int.followup.send(f"Error updating attributes: {e}", ephemeral=True)
@@ -607,7 +685,7 @@ class SearchView(View):
                                 verify=False
                             )
                             logger.info(f"[Complete Session] Status: {comp_resp.status_code}")
-                            logger.info(f"[Complete Session] Body: {comp_resp.text}")
+                            logger.debug("[Complete Session] Body: %s", Preview(comp_resp.text))
                         except Exception as e:
                             logger.error(f"[Complete Session] Exception: {e}")
                             await confirm_int.followup.send(f"Error completing session: {e}", ephemeral=True)
@@ -639,6 +717,7 @@ class SearchView(View):
             logger.error(f"Error during scrape: {e}")
             await interaction.followup.send(f"An error occurred while scraping: {e}", ephemeral=True)
 
+    @instrument_callback
     async def magnets_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
@@ -651,41 +730,226 @@ class SearchView(View):
             magnets = "\n".join([stream.get("uri", "No URI") for stream in data][:5])
             await interaction.response.send_message(f"Magnets for {name}:\n{magnets}", ephemeral=True)
 
+    @instrument_callback
+    async def multi_button_callback(self, interaction: discord.Interaction):
+        if not await check_authorization(interaction, self.initiator_id):
+            return
+        self.multi_select = not self.multi_select
+        self.bulk_selection = []
+        self.update_view()
+        await interaction.response.edit_message(view=self)
+
+    @instrument_callback
+    @admitted("bulk")
+    async def bulk_add_button_callback(self, interaction: discord.Interaction):
+        if not await check_authorization(interaction, self.initiator_id):
+            return
+        results = [self.all_results[idx] for idx in self.bulk_selection if idx < len(self.all_results)]
+        logger.info(f"{interaction.user} bulk adding {len(results)} items")
+        await bulk_add_results(interaction, results, self.ctx.bot)
+        self.multi_select = False
+        self.bulk_selection = []
+        self.update_view()
+        await interaction.message.edit(view=self)
+
+    @instrument_callback
+    @admitted("bulk")
+    async def add_all_button_callback(self, interaction: discord.Interaction):
+        if not await check_authorization(interaction, self.initiator_id):
+            return
+        logger.info(f"{interaction.user} adding all {len(self.all_results)} results for '{self.query}'")
+        await bulk_add_results(interaction, self.all_results, self.ctx.bot)
+
+    @instrument_callback
     async def refresh_button_callback(self, interaction: discord.Interaction):
         if not await check_authorization(interaction, self.initiator_id):
             return
         name, year, rating, imdb_id, tmdb_id, poster, description, vote_count, media_type, seasons = self.selected_item
         logger.info(f"{interaction.user} refreshing {name}")
-        riven_response = query_riven_api("items", self.ctx.bot.config, params={"search": name, "limit": 50})
-        riven_state = "Not in Riven"
-        if riven_response.get("success", False) and "items" in riven_response:
-            for item in riven_response["items"]:
-                if item.get("tmdb_id") == str(tmdb_id) or item.get("imdb_id") == imdb_id:
-                    self.riven_id = item.get("id")
-                    riven_state = item.get("state", "Unknown")
-                    break
-        recommended_response = requests.get(f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}/recommendations", params={"api_key": self.ctx.bot.config["tmdb_api_key"]})
-        recommended_data = recommended_response.json().get("results", [])[:5]
-        emoji_numbers = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
-        recommended_titles = [
-            f"{emoji_numbers[i]} {item['title' if media_type == 'movie' else 'name']} ({item['release_date' if media_type == 'movie' else 'first_air_date'][:4]}) - ★ {item['vote_average']}/10"
-            for i, item in enumerate(recommended_data)
-        ]
-        self.recommended_ids = [item['id'] for item in recommended_data]
-        embed = create_media_embed(self.query, name, year, rating, vote_count, description, imdb_id, tmdb_id, poster, riven_state, recommended_titles)
-        await interaction.response.edit_message(embed=embed, view=self)
-        message = await interaction.original_response()
+        config = self.ctx.bot.config
+
+        async def load():
+            riven_response, recommended_data = await asyncio.gather(
+                asyncio.to_thread(query_riven_api, "items", config, params={"search": name, "limit": 50}),
+                asyncio.to_thread(fetch_tmdb_recommendations, tmdb_id, media_type, config),
+            )
+            riven_state = "Not in Riven"
+            self.invalidate_riven_state()
+            if riven_response.get("success", False) and "items" in riven_response:
+                for item in riven_response["items"]:
+                    if item.get("tmdb_id") == str(tmdb_id) or item.get("imdb_id") == imdb_id:
+                        self.riven_id = item.get("id")
+                        riven_state = item.get("state", "Unknown")
+                        break
+            recommended_titles = format_recommended_titles(recommended_data, media_type)
+            self.recommended_ids = [item['id'] for item in recommended_data]
+            embed = create_media_embed(self.query, name, year, rating, vote_count, description, imdb_id, tmdb_id, poster, riven_state, recommended_titles)
+            return {"embed": embed, "view": self}
+
+        if await self.executor.run(interaction, load, placeholder=loading_embed(self.query, name)) is None:
+            return
+        message = interaction.message
         self.ctx.bot.active_recommended_messages[message.id] = self
-        reaction_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
-        for emoji in reaction_emojis[:len(self.recommended_ids)]:
-            await message.add_reaction(emoji)
-            logger.info(f"Added reaction {emoji} to refreshed message {message.id}")
+        await self.ctx.bot.reaction_manager.sync(message, RECOMMENDATION_EMOJIS[:len(self.recommended_ids)])
+
+
+async def bulk_add_results(interaction, results, bot):
+    """Add (name, year, rating, tmdb_id, media_type) results to Riven in batches, reporting progress ephemerally.
+
+    The user is subscribed to every added item, so they hear about completions in one batched DM.
+    """
+    config = bot.config
+    if not interaction.response.is_done():
+        await interaction.response.defer(ephemeral=True)
+    imdb_ids, missing = await resolve_imdb_ids(results, config)
+    progress_msg = await interaction.followup.send(f"Adding {len(imdb_ids)} items...", ephemeral=True, wait=True)
+
+    async def progress(result):
+        await progress_msg.edit(content=result.summary())
+
+    result = await run_bulk_action("add", imdb_ids, config, progress)
+    for riven_id in result.ids:
+        bot.subscriptions.subscribe(riven_id, f"user:{interaction.user.id}")
+    text = result.summary()
+    if missing:
+        text += f"\nNo IMDb ID for: {', '.join(missing)}"
+    await progress_msg.edit(content=text)
+
 
 class LatestReleasesView(View):
     def __init__(self, ctx, recent_items):
-        super().__init__(timeout=300)
+        super().__init__(timeout=None)
         self.ctx = ctx
         self.recent_items = recent_items
         self.initiator_id = ctx.author.id
+        self.message_id = None
+        self.touched_at = time.time()
         # Add the select menu to the view.
         self.add_item(LatestReleasesDropdown(recent_items))
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        self.touched_at = time.time()
+        return True
+
+    def to_state(self):
+        return {
+            "kind": "latest", "message_id": self.message_id, "touched_at": self.touched_at,
+            "initiator_id": self.initiator_id, "recent_items": self.recent_items,
+        }
+
+    @classmethod
+    def from_state(cls, ctx, state):
+        view = cls(ctx, state["recent_items"])
+        view.touched_at = state["touched_at"]
+        return view
+
+
+class RecentlyAddedView(View):
+    """Pages through Riven's most recently added items, one Riven request per page.
+
+    Only the visible page is enriched with posters, and poster paths come from
+    the metadata cache after the first lookup.
+    """
+
+    def __init__(self, ctx, page_size=5, page=1):
+        super().__init__(timeout=None)
+        self.ctx = ctx
+        self.initiator_id = ctx.author.id
+        self.page_size = page_size
+        self.page = page
+        self.total_items = None
+        self.has_next = False
+        self.message_id = None
+        self.touched_at = time.time()
+        self.executor = InteractionExecutor()
+
+        self.prev_button = Button(label="Previous", style=ButtonStyle.grey, custom_id="recent:prev")
+        self.prev_button.callback = self.prev_button_callback
+        self.next_button = Button(label="Next", style=ButtonStyle.grey, custom_id="recent:next")
+        self.next_button.callback = self.next_button_callback
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+        self.update_buttons()
+
+    @property
+    def total_pages(self):
+        return math.ceil(self.total_items / self.page_size) if self.total_items is not None else None
+
+    def update_buttons(self):
+        self.prev_button.disabled = self.page <= 1
+        self.next_button.disabled = not self.has_next
+
+    async def render(self):
+        """Fetch and format the current page; returns (content, embeds)."""
+        config = self.ctx.bot.config
+        params = {"sort": "date_desc", "limit": self.page_size, "page": self.page, "type": "movie,show"}
+        data = await asyncio.to_thread(query_riven_api, "items", config, params=params)
+        if "error" in data:
+            self.has_next = False
+            self.update_buttons()
+            return f"Error: {data['error']}", []
+        items = data.get("items", [])
+        title_index.add_riven_items(items)
+        self.total_items = data.get("total_items")
+        total_pages = self.total_pages
+        self.has_next = self.page < total_pages if total_pages is not None else len(items) == self.page_size
+        self.update_buttons()
+        if not items:
+            return "No recent items.", []
+
+        def lookup(item):
+            media_type = "movie" if item.get("type", "").lower() == "movie" else "tv"
+            return fetch_poster_path(item["tmdb_id"], media_type, config) if item.get("tmdb_id") else None
+
+        poster_paths = await asyncio.gather(*(asyncio.to_thread(lookup, item) for item in items))
+        size = config.get("recently_added_poster_size", "w185")
+        embeds = []
+        for item, poster_path in zip(items, poster_paths):
+            item_type = item.get("type", "Unknown").lower()
+            embed = discord.Embed(title=f"{item_type.capitalize()}: {item.get('title', 'Unknown')}", description=f"State: {item.get('state', 'Unknown')}")
+            if poster_path:
+                embed.set_thumbnail(url=poster_url(poster_path, size))
+            embeds.append(embed)
+        page_label = f"{self.page}/{total_pages}" if total_pages else str(self.page)
+        return f"**Recently Added (page {page_label}):**", embeds
+
+    async def change_page(self, interaction, delta):
+        if not await check_authorization(interaction, self.initiator_id):
+            return
+        logger.info(f"{interaction.user} moved recently added to page {self.page + delta}")
+        self.page = max(1, self.page + delta)
+
+        async def load():
+            content, embeds = await self.render()
+            return {"content": content, "embeds": embeds, "view": self}
+
+        # Rapid clicks cancel the pages in between, so only the last one is fetched and shown.
+        await self.executor.run(interaction, load)
+
+    @instrument_callback
+    async def prev_button_callback(self, interaction: discord.Interaction):
+        await self.change_page(interaction, -1)
+
+    @instrument_callback
+    async def next_button_callback(self, interaction: discord.Interaction):
+        await self.change_page(interaction, 1)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        self.touched_at = time.time()
+        return True
+
+    def to_state(self):
+        return {
+            "kind": "recent", "message_id": self.message_id, "touched_at": self.touched_at,
+            "initiator_id": self.initiator_id, "page_size": self.page_size, "page": self.page,
+            "total_items": self.total_items, "has_next": self.has_next,
+        }
+
+    @classmethod
+    def from_state(cls, ctx, state):
+        view = cls(ctx, page_size=state["page_size"], page=state["page"])
+        view.total_items = state["total_items"]
+        view.has_next = state["has_next"]
+        view.touched_at = state["touched_at"]
+        view.update_buttons()
+        return view